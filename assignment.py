@@ -0,0 +1,413 @@
+import heapq
+import time
+from collections import deque
+import numpy as np
+from typing import Iterable, List, Optional, Tuple
+
+from bfs_parking import ParkingSpotFinder
+from distance_field import DistanceField
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # SciPy is optional, the NumPy solver below is used instead
+    linear_sum_assignment = None
+
+# Assignment methods and objectives accepted by SpotAssigner.assign
+METHODS = ("greedy", "optimal")
+OBJECTIVES = ("total", "max")
+
+
+class AssignmentResult:
+    def __init__(self, starts: List[Tuple[int, int]], spots: List[Optional[Tuple[int, int, int]]],
+                 method: str, objective: str, elapsed: float):
+        """
+        Spots assigned to a group of vehicles.
+
+        :param starts: Starting coordinates (row, col) of each vehicle
+        :param spots: Assigned (row, col, distance) of each vehicle, None if no spot was left
+        :param method: Method that produced the assignment
+        :param objective: Objective the method minimized
+        :param elapsed: Wall time of the assignment in seconds
+        """
+        self.starts = starts
+        self.spots = spots
+        self.method = method
+        self.objective = objective
+        self.elapsed = elapsed
+
+    @property
+    def assigned(self) -> int:
+        return sum(spot is not None for spot in self.spots)
+
+    @property
+    def total_distance(self) -> int:
+        return sum(spot[2] for spot in self.spots if spot is not None)
+
+    @property
+    def max_distance(self) -> int:
+        return max((spot[2] for spot in self.spots if spot is not None), default=0)
+
+
+class SpotAssigner:
+    def __init__(self, finder: ParkingSpotFinder):
+        """
+        Assign groups of vehicles to distinct empty spots.
+
+        Assigned spots are reserved: they count as occupied for later
+        assignments until released or reported occupied through
+        finder.set_occupied, which the assigner follows.
+
+        :param finder: ParkingSpotFinder over the parking grid
+        """
+        self.finder = finder
+        self.reserved = set()
+
+        # Copy of the grid with reserved spots marked occupied, and the
+        # distance field from its empty spots that drives the assignment
+        self._available = ParkingSpotFinder(np.array(finder.grid, dtype=np.uint8))
+        self._field = DistanceField(self._available)
+
+        finder.add_listener(self._on_occupancy_change)
+
+    def assign(self, starts: Iterable[Tuple[int, int]], method: str = "greedy",
+               objective: str = "total", candidates: int = 8) -> AssignmentResult:
+        """
+        Assign every vehicle its own empty spot and reserve the spots.
+
+        "greedy" repeatedly gives the globally closest remaining
+        vehicle-spot pair, using the distance field to find each vehicle's
+        nearest available spot in O(1). "optimal" solves the assignment
+        problem exactly over each vehicle's nearest candidate spots,
+        minimizing the total distance or, for objective "max", the longest
+        distance and then the total.
+
+        :param starts: Starting coordinates (row, col) of each vehicle
+        :param method: "greedy" or "optimal"
+        :param objective: "total" or "max", used by the optimal method
+        :param candidates: Nearest spots per vehicle considered by the optimal method
+        :return: AssignmentResult, with None for vehicles left without a spot
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown assignment method: {method}")
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown assignment objective: {objective}")
+        if candidates < 1:
+            raise ValueError("At least one candidate spot per vehicle is required")
+
+        starts = [tuple(start) for start in starts]
+        for start in starts:
+            if not self.finder._is_valid_position(start[0], start[1]):
+                raise ValueError(f"Invalid starting position: {start}")
+
+        began = time.perf_counter()
+        if method == "greedy":
+            spots = self._assign_greedy(starts)
+        else:
+            spots = self._assign_optimal(starts, objective, candidates)
+            for spot in spots:
+                if spot is not None:
+                    self._reserve(spot[0], spot[1])
+        return AssignmentResult(starts, spots, method, objective, time.perf_counter() - began)
+
+    def release(self, row: int, col: int):
+        """
+        Make a reserved spot available again, if it is still empty.
+
+        :param row: Row index
+        :param col: Column index
+        """
+        self.reserved.discard((row, col))
+        if self.finder.grid[row, col] == 0:
+            self._available.set_occupied(row, col, False)
+
+    def detach(self):
+        """
+        Stop following occupancy changes of the finder.
+        """
+        self.finder.remove_listener(self._on_occupancy_change)
+        self._field.detach()
+
+    def _reserve(self, row: int, col: int):
+        self.reserved.add((row, col))
+        self._available.set_occupied(row, col, True)
+
+    def _on_occupancy_change(self, row: int, col: int, occupied: bool):
+        """
+        Mirror an occupancy change of the finder, keeping reservations.
+
+        :param row: Row index
+        :param col: Column index
+        :param occupied: New occupancy of the spot
+        """
+        if (row, col) in self.reserved:
+            # The vehicle parked; the spot is no longer held for it
+            if occupied:
+                self.reserved.discard((row, col))
+            return
+        self._available.set_occupied(row, col, occupied)
+
+    def _assign_greedy(self, starts: List[Tuple[int, int]]) -> List[Optional[Tuple[int, int, int]]]:
+        """
+        Assign closest vehicle-spot pairs first, reserving each spot as it is taken.
+
+        Distances only grow as spots are taken, so a heap keyed on each
+        vehicle's last known distance is a valid lower bound: a popped entry
+        is either still current and the global minimum, or is pushed back
+        with its new distance.
+
+        :param starts: Starting coordinates of each vehicle
+        :return: Assigned (row, col, distance) per vehicle
+        """
+        field = self._field
+        spots = [None] * len(starts)
+        heap = [(distance, vehicle) for vehicle, distance in
+                enumerate(field.distance(row, col) for row, col in starts) if distance is not None]
+        heapq.heapify(heap)
+
+        while heap:
+            distance, vehicle = heapq.heappop(heap)
+            current = field.distance(*starts[vehicle])
+            if current is None:
+                # No empty spot is left for anyone
+                break
+            if current != distance:
+                heapq.heappush(heap, (current, vehicle))
+                continue
+
+            spot = field.nearest_spot(*starts[vehicle])
+            spots[vehicle] = spot
+            self._reserve(spot[0], spot[1])
+        return spots
+
+    def _assign_optimal(self, starts: List[Tuple[int, int]], objective: str,
+                        candidates: int) -> List[Optional[Tuple[int, int, int]]]:
+        """
+        Solve the assignment problem over the vehicles' nearest candidate spots.
+
+        Every cell is drivable, so the distance between any vehicle and any
+        candidate is exact Manhattan distance and the cost matrix covers the
+        union of all candidates, not just each vehicle's own. The greedy
+        assignment's spots are always candidates, so the result is never
+        worse than greedy and every vehicle greedy could serve gets a spot.
+
+        :param starts: Starting coordinates of each vehicle
+        :param objective: "total" or "max"
+        :param candidates: Nearest spots per vehicle to start from
+        :return: Assigned (row, col, distance) per vehicle
+        """
+        greedy = self._assign_greedy(starts)
+        for spot in greedy:
+            if spot is not None:
+                self.reserved.discard(spot[:2])
+                self._available.set_occupied(spot[0], spot[1], False)
+        if not any(greedy):
+            return greedy
+
+        pool = {spot[:2] for spot in greedy if spot is not None}
+        for start in starts:
+            pool.update(self._nearest_spots(start, candidates))
+        pool = sorted(pool)
+
+        vehicles = np.array(starts, dtype=np.int64)
+        spots = np.array(pool, dtype=np.int64)
+        cost = np.abs(vehicles[:, None, :] - spots[None, :, :]).sum(axis=2)
+
+        if objective == "max":
+            # Smallest threshold under which every vehicle greedy served still
+            # gets a spot: at least the farthest nearest spot, at most the greedy maximum
+            column = {spot: index for index, spot in enumerate(pool)}
+            initial = [column[spot[:2]] if spot is not None else -1 for spot in greedy]
+            served = sum(spot is not None for spot in greedy)
+            lowest = cost.min(axis=1).max() if len(pool) >= len(starts) else 0
+            highest = max(spot[2] for spot in greedy if spot is not None)
+            thresholds = np.unique(cost[(cost >= lowest) & (cost <= highest)])
+            low, high = 0, len(thresholds) - 1
+            while low < high:
+                middle = (low + high) // 2
+                if _matching_size(cost <= thresholds[middle], initial) == served:
+                    high = middle
+                else:
+                    low = middle + 1
+            limit = thresholds[low]
+            rows, cols = _solve(np.where(cost <= limit, cost, cost.max() * len(starts) + 1))
+        else:
+            rows, cols = _solve(cost)
+
+        assigned = [None] * len(starts)
+        for vehicle, spot in zip(rows, cols):
+            assigned[vehicle] = pool[spot] + (int(cost[vehicle, spot]),)
+        return assigned
+
+    def _nearest_spots(self, start: Tuple[int, int], count: int) -> List[Tuple[int, int]]:
+        """
+        Collect at least count available spots nearest to a start, ring by ring.
+
+        Scanning starts at the ring of the nearest available spot and
+        finishes the ring it is on, so ties are kept together.
+
+        :param start: Starting coordinates (row, col)
+        :param count: Number of spots wanted
+        :return: Coordinates of the spots, fewer only if the grid has fewer
+        """
+        available = self._available
+        cells, index = available._cells, available._index
+        rows, cols = available.rows, available.cols
+        row, col = start
+
+        distance = self._field.distance(row, col)
+        if distance is None:
+            return []
+
+        found = []
+        last_ring = (rows - 1) + (cols - 1)
+        while len(found) < count and distance <= last_ring:
+            for row_offset in range(-distance, distance + 1):
+                r = row + row_offset
+                if not 0 <= r < rows:
+                    continue
+                rest = distance - abs(row_offset)
+                for c in ((col - rest, col + rest) if rest else (col,)):
+                    if 0 <= c < cols and cells[index(r, c)] == 0:
+                        found.append((r, c))
+            distance += 1
+        return found
+
+
+def assign_spots(finder: ParkingSpotFinder, starts: Iterable[Tuple[int, int]], method: str = "greedy",
+                 objective: str = "total", candidates: int = 8) -> AssignmentResult:
+    """
+    Assign every vehicle its own empty spot once, without keeping reservations.
+
+    :param finder: ParkingSpotFinder over the parking grid
+    :param starts: Starting coordinates (row, col) of each vehicle
+    :param method: "greedy" or "optimal", see SpotAssigner.assign
+    :param objective: "total" or "max"
+    :param candidates: Nearest spots per vehicle considered by the optimal method
+    :return: AssignmentResult, with None for vehicles left without a spot
+    """
+    assigner = SpotAssigner(finder)
+    try:
+        return assigner.assign(starts, method, objective, candidates)
+    finally:
+        assigner.detach()
+
+
+def _matching_size(allowed: np.ndarray, initial: List[int]) -> int:
+    """
+    Size of a maximum matching of vehicles to spots over the allowed pairs.
+
+    Starts from the allowed pairs of an initial assignment and grows it along
+    augmenting paths found by breadth-first search.
+
+    :param allowed: Boolean matrix of shape (vehicles, spots)
+    :param initial: Spot column of each vehicle in a starting assignment, -1 for none
+    :return: Number of matched vehicles
+    """
+    match = [-1] * len(initial)
+    owner = {}
+    for vehicle, spot in enumerate(initial):
+        if spot >= 0 and allowed[vehicle, spot]:
+            match[vehicle] = spot
+            owner[spot] = vehicle
+
+    for root in range(len(initial)):
+        if match[root] >= 0:
+            continue
+        came_from = {}
+        queue = deque([root])
+        while queue:
+            vehicle = queue.popleft()
+            for spot in np.flatnonzero(allowed[vehicle]).tolist():
+                if spot in came_from:
+                    continue
+                came_from[spot] = vehicle
+                if spot in owner:
+                    queue.append(owner[spot])
+                    continue
+                # Free spot: flip the alternating path back to the root
+                while True:
+                    vehicle = came_from[spot]
+                    previous = match[vehicle]
+                    match[vehicle] = spot
+                    owner[spot] = vehicle
+                    if vehicle == root:
+                        break
+                    spot = previous
+                queue.clear()
+                break
+    return len(owner)
+
+
+def _solve(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Solve a rectangular linear assignment problem.
+
+    :param cost: Cost matrix of shape (vehicles, spots)
+    :return: Tuple (row indices, column indices) of the min(shape) assigned pairs
+    """
+    if linear_sum_assignment is not None:
+        return linear_sum_assignment(cost)
+
+    if cost.shape[0] > cost.shape[1]:
+        cols, rows = _hungarian(cost.T)
+        order = np.argsort(rows)
+        return rows[order], cols[order]
+    return _hungarian(cost)
+
+
+def _hungarian(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hungarian algorithm with potentials for at most as many rows as columns.
+
+    Rows are added one at a time along shortest augmenting paths; the inner
+    loop over columns is vectorized, so the Python work is O(rows^2).
+
+    :param cost: Cost matrix of shape (n, m) with n <= m
+    :return: Tuple (row indices, column indices) of the n assigned pairs
+    """
+    n, m = cost.shape
+    cost = cost.astype(float)
+
+    # 1-based as in the textbook formulation; column 0 is the virtual root
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.int64)
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for row in range(1, n + 1):
+        owner[0] = row
+        column = 0
+        min_slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[column] = True
+            current_row = owner[column]
+            free = ~used[1:]
+
+            slack = cost[current_row - 1] - u[current_row] - v[1:]
+            better = free & (slack < min_slack[1:])
+            min_slack[1:][better] = slack[better]
+            way[1:][better] = column
+
+            candidates = np.where(free, min_slack[1:], np.inf)
+            next_column = int(np.argmin(candidates)) + 1
+            delta = candidates[next_column - 1]
+
+            u[owner[used]] += delta
+            v[used] -= delta
+            min_slack[1:][free] -= delta
+
+            column = next_column
+            if owner[column] == 0:
+                break
+
+        # Flip the augmenting path
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+
+    cols = np.flatnonzero(owner[1:]) + 1
+    rows = owner[cols] - 1
+    order = np.argsort(rows)
+    return rows[order], cols[order] - 1
@@ -0,0 +1,60 @@
+"""
+Assignment of a burst of arriving vehicles to distinct spots: greedy against optimal.
+
+Usage: python benchmarks/bench_assignment.py [--size 1000] [--occupancy 0.9] [--vehicles 500]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bfs_parking import ParkingSpotFinder
+from assignment import SpotAssigner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="Rows and columns of the grid")
+    parser.add_argument("--occupancy", type=float, default=0.9, help="Fraction of occupied spots")
+    parser.add_argument("--vehicles", type=int, default=500, help="Vehicles arriving in one tick")
+    parser.add_argument("--entrances", type=int, default=4, help="Number of entrances the vehicles arrive at")
+    parser.add_argument("--candidates", type=int, default=8, help="Candidate spots per vehicle for the optimal method")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    grid = (rng.random((args.size, args.size)) < args.occupancy).astype(np.uint8)
+    finder = ParkingSpotFinder(grid)
+
+    # Vehicles queue up at a few entrances, so many share a nearest spot
+    entrances = rng.integers(0, args.size, size=(args.entrances, 2))
+    starts = [tuple(map(int, entrances[i])) for i in rng.integers(0, args.entrances, size=args.vehicles)]
+
+    began = time.perf_counter()
+    assigner = SpotAssigner(finder)
+    setup_time = time.perf_counter() - began
+
+    # Sending every vehicle to its own nearest spot collides on shared spots
+    nearest = finder.find_closest_parking_spots_batch(starts)
+    distinct = len({spots[0][:2] for spots in nearest if spots})
+
+    print(f"grid {args.size}x{args.size}, occupancy {args.occupancy:.0%}, "
+          f"{args.vehicles} vehicles at {args.entrances} entrances")
+    print(f"assigner setup: {setup_time * 1000:8.1f} ms")
+    print(f"nearest spot per vehicle: {distinct} distinct spots for {args.vehicles} vehicles")
+    print(f"{'method':<16} {'ms':>9} {'assigned':>9} {'total':>9} {'max':>6}")
+    for method, objective in (("greedy", "total"), ("optimal", "total"), ("optimal", "max")):
+        result = assigner.assign(starts, method, objective, args.candidates)
+        print(f"{method + '/' + objective:<16} {result.elapsed * 1000:9.1f} {result.assigned:9d} "
+              f"{result.total_distance:9d} {result.max_distance:6d}")
+        for spot in result.spots:
+            if spot is not None:
+                assigner.release(spot[0], spot[1])
+
+
+if __name__ == "__main__":
+    main()
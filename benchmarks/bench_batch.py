@@ -0,0 +1,55 @@
+"""
+Throughput of find_closest_parking_spots_batch against a per-call loop.
+
+Usage: python benchmarks/bench_batch.py [--size 1000] [--occupancy 0.9] [--queries 20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bfs_parking import ParkingSpotFinder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="Rows and columns of the grid")
+    parser.add_argument("--occupancy", type=float, default=0.9, help="Fraction of occupied spots")
+    parser.add_argument("--queries", type=int, default=20000, help="Number of start points")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    grid = (rng.random((args.size, args.size)) < args.occupancy).astype(np.uint8)
+    starts = [tuple(map(int, start)) for start in rng.integers(0, args.size, size=(args.queries, 2))]
+    finder = ParkingSpotFinder(grid)
+
+    began = time.perf_counter()
+    looped = [finder.find_closest_parking_spots(start) for start in starts]
+    loop_time = time.perf_counter() - began
+
+    # The first batch call also builds the shared distance field
+    began = time.perf_counter()
+    batched = finder.find_closest_parking_spots_batch(starts)
+    cold_time = time.perf_counter() - began
+
+    began = time.perf_counter()
+    batched = finder.find_closest_parking_spots_batch(starts)
+    warm_time = time.perf_counter() - began
+
+    # Same spots, the batch just reports them in (row, col) order
+    assert all(sorted(a) == b for a, b in zip(looped, batched))
+
+    print(f"grid {args.size}x{args.size}, occupancy {args.occupancy:.0%}, {args.queries} queries")
+    print(f"per-call loop: {loop_time:8.3f} s  {args.queries / loop_time:10.0f} queries/s")
+    print(f"batch (cold):  {cold_time:8.3f} s  {args.queries / cold_time:10.0f} queries/s")
+    print(f"batch (warm):  {warm_time:8.3f} s  {args.queries / warm_time:10.0f} queries/s")
+    print(f"speedup:       {loop_time / cold_time:8.1f}x cold, {loop_time / warm_time:.1f}x warm")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Event throughput of OccupancyFeed and how many subscribers each batch notifies.
+
+Usage: python benchmarks/bench_feed.py [--size 1000] [--occupancy 0.9] [--subscribers 5000] [--events 100000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bfs_parking import ParkingSpotFinder
+from occupancy_feed import OccupancyFeed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="Rows and columns of the grid")
+    parser.add_argument("--occupancy", type=float, default=0.9, help="Fraction of occupied spots")
+    parser.add_argument("--subscribers", type=int, default=5000, help="Number of subscribed start points")
+    parser.add_argument("--events", type=int, default=100000, help="Number of sensor events")
+    parser.add_argument("--batch-size", type=int, default=4096, help="Largest batch applied at once")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    grid = (rng.random((args.size, args.size)) < args.occupancy).astype(np.uint8)
+    finder = ParkingSpotFinder(grid)
+
+    # Sensors mostly report spots flipping around the current occupancy rate
+    cells = rng.integers(0, args.size, size=(args.events, 2))
+    occupied = rng.random(args.events) < args.occupancy
+    events = [(int(row), int(col), bool(state)) for (row, col), state in zip(cells, occupied)]
+
+    async def run():
+        feed = OccupancyFeed(finder, batch_size=args.batch_size, max_delay=0.01)
+        for start in rng.integers(0, args.size, size=(args.subscribers, 2)):
+            feed.subscribe((int(start[0]), int(start[1])), lambda start, closest_spots: None)
+
+        consumer = asyncio.create_task(feed.run())
+        began = time.perf_counter()
+        for row, col, state in events:
+            await feed.put(row, col, state)
+        while not feed.queue.empty():
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.02)
+        elapsed = time.perf_counter() - began
+        consumer.cancel()
+        return feed, elapsed
+
+    feed, elapsed = asyncio.run(run())
+    subscribed = len(feed.answers)
+    print(f"grid {args.size}x{args.size}, occupancy {args.occupancy:.0%}, "
+          f"{subscribed} subscribed starts, {args.events} events")
+    print(f"ingested:      {elapsed:8.3f} s  {feed.events_received / elapsed:10.0f} events/s")
+    print(f"batches:       {feed.batches_applied:8d}  {feed.cells_changed} spots changed")
+    print(f"notifications: {feed.notifications_sent:8d}  "
+          f"vs {subscribed * feed.batches_applied} when re-querying every start per batch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Nearest-spot queries on nearly full lots: BFS flooding against the free-spot index.
+
+Usage: python benchmarks/bench_free_index.py [--size 2000] [--occupancy 0.95] [--queries 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bfs_parking import ParkingSpotFinder
+
+
+def clustered_grid(size, occupancy, rng):
+    """
+    Build a lot whose vacancies are confined to a few small areas.
+
+    :param size: Rows and columns of the grid
+    :param occupancy: Occupied fraction between 0 and 1
+    :param rng: NumPy random generator
+    :return: 2D uint8 array
+    """
+    grid = np.ones((size, size), dtype=np.uint8)
+    free = int(size * size * (1 - occupancy))
+    side = max(1, int(np.sqrt(free / 4)))
+    for row, col in rng.integers(0, size - side, size=(4, 2)):
+        grid[row:row + side, col:col + side] = 0
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=2000, help="Rows and columns of the grid")
+    parser.add_argument("--occupancy", type=float, default=0.95, help="Fraction of occupied spots")
+    parser.add_argument("--queries", type=int, default=200, help="Number of start points")
+    parser.add_argument("--updates", type=int, default=100000, help="Number of occupancy changes timed")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"grid {args.size}x{args.size}, occupancy {args.occupancy:.0%}, {args.queries} queries")
+
+    for layout, grid in (("uniform", (rng.random((args.size, args.size)) < args.occupancy).astype(np.uint8)),
+                         ("clustered", clustered_grid(args.size, args.occupancy, rng))):
+        starts = [tuple(map(int, start)) for start in rng.integers(0, args.size, size=(args.queries, 2))]
+        flood = ParkingSpotFinder(grid)
+
+        began = time.perf_counter()
+        indexed = ParkingSpotFinder(grid.copy(), free_index=True)
+        build_time = time.perf_counter() - began
+
+        began = time.perf_counter()
+        expected = [sorted(flood.find_closest_parking_spots(start)) for start in starts]
+        flood_time = (time.perf_counter() - began) / args.queries
+
+        began = time.perf_counter()
+        answers = [indexed.find_closest_parking_spots(start) for start in starts]
+        index_time = (time.perf_counter() - began) / args.queries
+        assert answers == expected
+
+        cells = rng.integers(0, args.size, size=(args.updates, 2)).tolist()
+        states = (rng.random(args.updates) < args.occupancy).tolist()
+        began = time.perf_counter()
+        for (row, col), occupied in zip(cells, states):
+            indexed.set_occupied(row, col, occupied)
+        update_time = (time.perf_counter() - began) / args.updates
+
+        print(f"{layout}:")
+        print(f"  index build:   {build_time * 1000:10.1f} ms")
+        print(f"  BFS query:     {flood_time * 1000:10.3f} ms")
+        print(f"  index query:   {index_time * 1000:10.3f} ms  (speedup {flood_time / index_time:.1f}x)")
+        print(f"  index update:  {update_time * 1e6:10.2f} us per set_occupied")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Memory used by a parking grid and the visited map of a search in each representation.
+
+Usage: python benchmarks/bench_memory.py [--size 4000]
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bfs_parking import ParkingSpotFinder
+
+# Cells used to measure the per-cell cost of a set of (row, col) tuples
+TUPLE_SAMPLE = 1_000_000
+
+
+def measure(function):
+    """
+    Run a function and report the memory it allocated.
+
+    :param function: Callable without arguments
+    :return: Tuple (result, bytes still allocated after the call, peak bytes during the call)
+    """
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    result = function()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=4000, help="Rows and columns of the grid")
+    args = parser.parse_args()
+
+    size = args.size
+    cells = size * size
+
+    grid = (np.random.default_rng(0).random((size, size)) < 0.5).astype(np.uint8)
+
+    print(f"grid {size}x{size} ({cells} cells)")
+    print(f"{'representation':<22} {'grid MB':>9} {'B/cell':>7} {'visited MB':>11} {'B/cell':>7}")
+
+    def report(name, grid_bytes, visited_bytes, note=""):
+        print(f"{name:<22} {grid_bytes / 2**20:9.1f} {grid_bytes / cells:7.2f} "
+              f"{visited_bytes / 2**20:11.1f} {visited_bytes / cells:7.2f}{note}")
+
+    # Nested lists and a visited set of tuples, as the finder used to store them
+    _, list_bytes, _ = measure(grid.tolist)
+    sample = min(cells, TUPLE_SAMPLE)
+    _, set_bytes, _ = measure(lambda: {divmod(index, size) for index in range(sample)})
+    report("list + tuple set", list_bytes, set_bytes * cells / sample,
+           "  (visited set extrapolated)" if sample < cells else "")
+
+    for name, packed in (("uint8 + bytearray", False), ("bitset + bitset", True)):
+        finder, grid_bytes, _ = measure(lambda: ParkingSpotFinder(grid, packed=packed))
+        # A search holds one visited map covering the whole padded grid
+        _, visited_bytes, _ = measure(finder._new_visited)
+        report(name, grid_bytes, visited_bytes)
+        del finder
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Cross-floor nearest-spot queries in a multi-floor garage: ramp-graph search against a cell-level search.
+
+Usage: python benchmarks/bench_multilevel.py [--floors 8] [--size 300] [--ramps 4] [--queries 1000]
+"""
+import argparse
+import heapq
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from multilevel import MultiLevelGarage
+
+
+def cell_search(floors, ramps, start):
+    """
+    Reference search over every cell of every floor, ramps included.
+
+    :return: Sorted list of (floor, row, col, distance) of the closest spots
+    """
+    links = {}
+    for end, other, length in ramps:
+        links.setdefault(end, []).append((other, length))
+        links.setdefault(other, []).append((end, length))
+
+    rows, cols = floors[0].shape
+    distances = {start: 0}
+    heap = [(0, start)]
+    best, spots = None, []
+    while heap:
+        distance, location = heapq.heappop(heap)
+        if best is not None and distance > best:
+            break
+        if distance > distances[location]:
+            continue
+        floor, row, col = location
+        if floors[floor][row, col] == 0:
+            best = distance
+            spots.append(location + (distance,))
+            continue
+        neighbors = [((floor, row + dr, col + dc), 1) for dr, dc in ((-1, 0), (0, 1), (1, 0), (0, -1))
+                     if 0 <= row + dr < rows and 0 <= col + dc < cols]
+        for neighbor, length in neighbors + links.get(location, []):
+            if distance + length < distances.get(neighbor, float("inf")):
+                distances[neighbor] = distance + length
+                heapq.heappush(heap, (distance + length, neighbor))
+    return sorted(spots)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--floors", type=int, default=8, help="Number of floors")
+    parser.add_argument("--size", type=int, default=300, help="Rows and columns of each floor")
+    parser.add_argument("--ramps", type=int, default=4, help="Ramps between consecutive floors")
+    parser.add_argument("--queries", type=int, default=1000, help="Number of start points")
+    parser.add_argument("--reference", type=int, default=5, help="Queries checked against the cell-level search")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    size = args.size
+
+    # Lower floors fill up first: only the top floor has a few empty spots
+    floors = [np.ones((size, size), dtype=np.uint8) for _ in range(args.floors)]
+    top = floors[-1].reshape(-1)
+    top[rng.choice(size * size, 20, replace=False)] = 0
+    ramps = []
+    for floor in range(args.floors - 1):
+        for _ in range(args.ramps):
+            row, col = map(int, rng.integers(0, size, 2))
+            ramps.append(((floor, row, col), (floor + 1, row, col), 5))
+
+    began = time.perf_counter()
+    garage = MultiLevelGarage(floors, ramps)
+    setup_time = time.perf_counter() - began
+
+    starts = [(0,) + tuple(map(int, cell)) for cell in rng.integers(0, size, size=(args.queries, 2))]
+    began = time.perf_counter()
+    answers = [garage.find_closest_parking_spots(start) for start in starts]
+    query_time = time.perf_counter() - began
+
+    began = time.perf_counter()
+    for start, answer in zip(starts[:args.reference], answers):
+        assert cell_search(floors, ramps, start) == answer
+    reference_time = (time.perf_counter() - began) / max(1, args.reference)
+
+    print(f"{args.floors} floors of {size}x{size}, {len(ramps)} ramps, starts on the ground floor")
+    print(f"setup:             {setup_time * 1000:10.1f} ms")
+    print(f"ramp-graph search: {query_time / args.queries * 1000:10.3f} ms per query")
+    print(f"cell-level search: {reference_time * 1000:10.3f} ms per query (same answers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Scaling of ParallelParkingEngine across worker counts.
+
+Usage: python benchmarks/bench_parallel.py [--grids 64] [--size 1000] [--queries 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bfs_parking import ParkingSpotFinder
+from parallel_engine import ParallelParkingEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--grids", type=int, default=64, help="Number of grid snapshots")
+    parser.add_argument("--size", type=int, default=1000, help="Rows and columns of each grid")
+    parser.add_argument("--occupancy", type=float, default=0.95, help="Fraction of occupied spots")
+    parser.add_argument("--queries", type=int, default=200, help="Start points per grid")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        help="Worker counts to try, defaults to powers of two up to the CPU count")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    jobs = [((rng.random((args.size, args.size)) < args.occupancy).astype(np.uint8),
+             [tuple(map(int, start)) for start in rng.integers(0, args.size, size=(args.queries, 2))])
+            for _ in range(args.grids)]
+
+    worker_counts = args.workers
+    if not worker_counts:
+        cpus = os.cpu_count() or 1
+        worker_counts = [1 << power for power in range(cpus.bit_length()) if 1 << power <= cpus]
+        if worker_counts[-1] != cpus:
+            worker_counts.append(cpus)
+
+    print(f"{args.grids} grids {args.size}x{args.size}, occupancy {args.occupancy:.0%}, "
+          f"{args.queries} queries per grid")
+
+    began = time.perf_counter()
+    for grid, starts in jobs:
+        ParkingSpotFinder(grid).find_closest_parking_spots_batch(starts)
+    serial_time = time.perf_counter() - began
+    print(f"{'in-process':>12}: {serial_time:8.3f} s  {args.grids / serial_time:8.1f} grids/s")
+
+    for workers in worker_counts:
+        with ParallelParkingEngine(workers=workers) as engine:
+            # Start the workers before timing
+            list(engine.map_closest_spots(jobs[:workers]))
+
+            began = time.perf_counter()
+            done = sum(1 for _ in engine.map_closest_spots(jobs))
+            elapsed = time.perf_counter() - began
+        assert done == args.grids
+        print(f"{workers:>4} workers: {elapsed:8.3f} s  {args.grids / elapsed:8.1f} grids/s  "
+              f"{serial_time / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Repeated queries on oscillating snapshots of a nearly full lot, with and without the result cache.
+
+Usage: python benchmarks/bench_result_cache.py [--size 1000] [--snapshots 4] [--rounds 5] [--queries 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bfs_parking import ParkingSpotFinder
+from result_cache import ResultCache
+from scenarios import clustered_grid
+
+
+def run(finder, toggles, starts, rounds):
+    """
+    Cycle the finder through the snapshots and query every start on each one.
+
+    :param finder: ParkingSpotFinder on the first snapshot
+    :param toggles: Cells flipped to move from one snapshot to the next, per snapshot
+    :param starts: Start cells
+    :param rounds: Number of cycles through the snapshots
+    :return: (seconds, answers)
+    """
+    answers = []
+    began = time.perf_counter()
+    for _ in range(rounds):
+        for cells in toggles:
+            answers.append([finder.find_closest_parking_spots(start) for start in starts])
+            grid = finder.grid
+            for row, col in cells:
+                finder.set_occupied(row, col, not grid[row, col])
+    return time.perf_counter() - began, answers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="Rows and columns of the grid")
+    parser.add_argument("--occupancy", type=float, default=0.99, help="Fraction of occupied spots")
+    parser.add_argument("--snapshots", type=int, default=4, help="Distinct occupancy states cycled through")
+    parser.add_argument("--rounds", type=int, default=5, help="Cycles through the snapshots")
+    parser.add_argument("--queries", type=int, default=50, help="Start points queried on every snapshot")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    grid = clustered_grid(args.size, args.size, args.occupancy, rng, cluster_size=64, noise=0)
+    starts = [tuple(map(int, start)) for start in rng.integers(0, args.size, size=(args.queries, 2))]
+
+    # Each snapshot flips a few cells; the last flips back to the first snapshot
+    steps = [[tuple(map(int, cell)) for cell in rng.integers(0, args.size, size=(8, 2))]
+             for _ in range(args.snapshots - 1)]
+    toggles = steps + [[cell for step in reversed(steps) for cell in reversed(step)]]
+    queries = args.snapshots * args.rounds * args.queries
+    print(f"grid {args.size}x{args.size}, {args.snapshots} snapshots x {args.rounds} rounds x "
+          f"{args.queries} queries = {queries} queries")
+
+    plain_time, expected = run(ParkingSpotFinder(grid.copy(), seed=1), toggles, starts, args.rounds)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "results.sqlite")
+        with ResultCache(path) as cache:
+            cached_time, answers = run(ParkingSpotFinder(grid.copy(), seed=1, result_cache=cache),
+                                       toggles, starts, args.rounds)
+            assert answers == expected
+            first_stats = cache.stats()
+
+        # A new process: empty memory tier, results read back from the file
+        with ResultCache(path) as cache:
+            restart_time, answers = run(ParkingSpotFinder(grid.copy(), seed=1, result_cache=cache),
+                                        toggles, starts, args.rounds)
+            assert answers == expected
+            restart_stats = cache.stats()
+
+    print(f"  no cache:        {plain_time / queries * 1000:10.3f} ms per query")
+    print(f"  result cache:    {cached_time / queries * 1000:10.3f} ms per query  "
+          f"(speedup {plain_time / cached_time:.1f}x, hit rate {first_stats['hit_rate']:.0%})")
+    print(f"  after restart:   {restart_time / queries * 1000:10.3f} ms per query  "
+          f"(speedup {plain_time / restart_time:.1f}x, {restart_stats['disk_hits']} disk hits, "
+          f"{restart_stats['misses']} misses)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Routing cost of find_route_astar against the plain BFS find_route_to_parking_spot.
+
+Usage: python benchmarks/bench_routing.py [--size 1000] [--occupancy 0.2] [--routes 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bfs_parking import ParkingSpotFinder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="Rows and columns of the grid")
+    parser.add_argument("--occupancy", type=float, default=0.2, help="Fraction of occupied spots")
+    parser.add_argument("--routes", type=int, default=5, help="Number of random start/target pairs")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    grid = (rng.random((args.size, args.size)) < args.occupancy).astype(np.uint8)
+    finder = ParkingSpotFinder(grid)
+    cells = args.size * args.size
+
+    print(f"grid {args.size}x{args.size} ({cells} cells), occupancy {args.occupancy:.0%}")
+    print(f"{'start':>12} {'target':>12} {'length':>7} {'bfs s':>8} "
+          f"{'a* s':>8} {'a* expanded':>12} {'a*+avoid s':>11} {'expanded':>9}")
+    for _ in range(args.routes):
+        start, target = (tuple(map(int, point)) for point in rng.integers(0, args.size, size=(2, 2)))
+
+        began = time.perf_counter()
+        route = finder.find_route_to_parking_spot(start, target)
+        bfs_time = time.perf_counter() - began
+
+        began = time.perf_counter()
+        astar_route, expanded = finder.find_route_astar(start, target)
+        astar_time = time.perf_counter() - began
+        assert len(astar_route) == len(route)
+
+        began = time.perf_counter()
+        _, avoid_expanded = finder.find_route_astar(start, target, avoid_occupied=True)
+        avoid_time = time.perf_counter() - began
+
+        print(f"{str(start):>12} {str(target):>12} {len(route):>7} {bfs_time:8.3f} "
+              f"{astar_time:8.3f} {expanded:>12} {avoid_time:11.3f} {avoid_expanded:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Scenario generation throughput: the GUI's list-based Randomize Grid versus the vectorized scenario module.
+
+Usage: python benchmarks/bench_scenarios.py [--size 1000] [--count 20] [--occupancy 0.3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bfs_parking import ParkingSpotFinder
+from scenarios import LAYOUTS, generate_scenarios
+
+
+def list_grid(rows, cols, occupancy_rate):
+    """
+    Build a grid the way Randomize Grid did: sample coordinates, fill nested lists.
+
+    :param rows: Number of rows
+    :param cols: Number of columns
+    :param occupancy_rate: Occupied fraction between 0 and 1
+    :return: 2D list
+    """
+    all_coords = [(r, c) for r in range(rows) for c in range(cols)]
+    grid = [[0 for _ in range(cols)] for _ in range(rows)]
+    for r, c in random.sample(all_coords, int(rows * cols * occupancy_rate)):
+        grid[r][c] = 1
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="Side of the square grids")
+    parser.add_argument("--count", type=int, default=20, help="Scenarios per method")
+    parser.add_argument("--occupancy", type=float, default=0.3, help="Occupied fraction")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    size = args.size
+
+    print(f"{args.count} scenarios of {size}x{size}, occupancy {args.occupancy}")
+    print(f"{'method':<24} {'ms/scenario':>12} {'+ finder ms':>12}")
+
+    random.seed(args.seed)
+    began = time.perf_counter()
+    for _ in range(args.count):
+        list_grid(size, size, args.occupancy)
+    generated = time.perf_counter()
+    for _ in range(args.count):
+        ParkingSpotFinder(list_grid(size, size, args.occupancy))
+    finished = time.perf_counter()
+    print(f"{'lists (old Randomize)':<24} {(generated - began) / args.count * 1000:12.1f} "
+          f"{(finished - generated) / args.count * 1000:12.1f}")
+
+    for layout in LAYOUTS:
+        began = time.perf_counter()
+        for _ in generate_scenarios(size, size, args.count, layout=layout, occupancy=args.occupancy, seed=args.seed):
+            pass
+        generated = time.perf_counter()
+        for grid in generate_scenarios(size, size, args.count, layout=layout, occupancy=args.occupancy,
+                                       seed=args.seed):
+            ParkingSpotFinder(grid)
+        finished = time.perf_counter()
+        print(f"{layout:<24} {(generated - began) / args.count * 1000:12.1f} "
+              f"{(finished - generated) / args.count * 1000:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Startup time of each entry point and module, measured in fresh interpreters.
+
+Usage: python benchmarks/bench_startup.py [--repeats 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Command lines run in a fresh interpreter, from the repository root
+TARGETS = [
+    ("python (baseline)", ["-c", "pass"]),
+    ("import numpy", ["-c", "import numpy"]),
+    ("import bfs_parking", ["-c", "import bfs_parking"]),
+    ("import parking_cli", ["-c", "import parking_cli"]),
+    ("import visualizations", ["-c", "import visualizations"]),
+    ("import parking_UI", ["-c", "import parking_UI"]),
+    ("python -m bfs_parking --help", ["-m", "bfs_parking", "--help"]),
+]
+
+
+def time_command(args, repeats):
+    """
+    Time a Python command line in fresh interpreters.
+
+    :param args: Arguments after the interpreter
+    :param repeats: Number of runs
+    :return: Median wall time in seconds, or None if the command fails
+    """
+    timings = []
+    for _ in range(repeats):
+        began = time.perf_counter()
+        completed = subprocess.run([sys.executable] + args, cwd=ROOT,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - began)
+        if completed.returncode != 0:
+            return None
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per command")
+    args = parser.parse_args()
+
+    # Loaded-module check: the batch entry point must not pull in GUI or plotting code
+    check = ("import sys, parking_cli; "
+             "print(sorted({name.split('.')[0] for name in sys.modules} & {'matplotlib', 'PyQt5', 'pandas'}))")
+    heavy = subprocess.run([sys.executable, "-c", check], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+
+    print(f"{'command':<32} {'median ms':>10}")
+    for name, command in TARGETS:
+        elapsed = time_command(command, args.repeats)
+        print(f"{name:<32} {'failed' if elapsed is None else f'{elapsed * 1000:10.1f}':>10}")
+    print(f"GUI/plotting modules loaded by parking_cli: {heavy or 'unknown'}")
+
+
+if __name__ == "__main__":
+    main()
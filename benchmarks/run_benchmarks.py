@@ -0,0 +1,195 @@
+"""
+Benchmark suite for bfs_parking: scaling over grid sizes and occupancy rates.
+
+Times finder construction, closest-spot search, routing and visualization on
+seeded random grids (the same workload as the GUI's Randomize Grid), writes the
+results as JSON and, given a baseline file, fails when any benchmark got slower
+than the allowed ratio.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline results.json --threshold 1.25
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import warnings
+
+import matplotlib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Draw figures off-screen; the visualizations call plt.show()
+matplotlib.use("Agg")
+warnings.filterwarnings("ignore", message=".*non-interactive.*")
+
+from bfs_parking import ParkingSpotFinder
+from scenarios import random_grid
+from visualizations import visualize_parking_grid, visualize_route_on_parking_grid
+from weighted import WeightedParkingSpotFinder
+
+
+def time_call(function, repeats, min_sample=0.02):
+    """
+    Time a callable several times.
+
+    Fast calls are looped so each timed sample lasts at least min_sample
+    seconds, which keeps sub-millisecond benchmarks from failing on noise.
+
+    :param function: Callable without arguments
+    :param repeats: Number of timed samples
+    :param min_sample: Shortest duration of one sample in seconds
+    :return: Dict with the median and minimum wall time per call in seconds
+    """
+    number = 1
+    while True:
+        began = time.perf_counter()
+        for _ in range(number):
+            function()
+        if time.perf_counter() - began >= min_sample:
+            break
+        number *= 2
+
+    timings = []
+    for _ in range(repeats):
+        began = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - began) / number)
+    return {"median": statistics.median(timings), "min": min(timings),
+            "repeats": repeats, "number": number}
+
+
+def run_suite(sizes, occupancies, repeats, visualize_max, seed):
+    """
+    Run every benchmark on every grid size and occupancy rate.
+
+    :return: Dict mapping benchmark name to its timings
+    """
+    results = {}
+    for size in sizes:
+        for occupancy in occupancies:
+            rng = np.random.default_rng(seed)
+            grid = random_grid(size, size, occupancy, rng)
+            grid_list = grid.tolist()
+            start = (size // 2, size // 2)
+            target = (size - 1, size - 1)
+            label = f"{size}x{size}/occ{round(occupancy * 100)}"
+
+            finder = ParkingSpotFinder(grid, seed=seed, cache_size=0)
+            results[f"construct_list/{label}"] = time_call(lambda: ParkingSpotFinder(grid_list), repeats)
+            results[f"construct_array/{label}"] = time_call(lambda: ParkingSpotFinder(grid), repeats)
+            results[f"closest_spots/{label}"] = time_call(
+                lambda: finder.find_closest_parking_spots(start), repeats)
+            results[f"route_bfs/{label}"] = time_call(
+                lambda: finder.find_route_to_parking_spot(start, target), repeats)
+            results[f"route_astar/{label}"] = time_call(
+                lambda: finder.find_route_astar(start, target), repeats)
+
+            # Lane weights of 1-4 with a turn penalty: bucket queue and heap
+            costs = rng.integers(1, 5, size=grid.shape)
+            bucketed = WeightedParkingSpotFinder(grid, costs, turn_penalty=2)
+            heaped = WeightedParkingSpotFinder(grid, costs.astype(float), turn_penalty=2)
+            results[f"route_weighted_bucket/{label}"] = time_call(
+                lambda: bucketed.find_route_to_parking_spot(start, target), repeats)
+            results[f"route_weighted_heap/{label}"] = time_call(
+                lambda: heaped.find_route_to_parking_spot(start, target), repeats)
+
+            if size <= visualize_max:
+                closest_spots = finder.find_closest_parking_spots(start)
+                route = finder.find_route_to_parking_spot(start, target)
+                results[f"visualize_grid/{label}"] = time_call(
+                    lambda: render(visualize_parking_grid, grid_list, start, closest_spots), repeats)
+                results[f"visualize_route/{label}"] = time_call(
+                    lambda: render(visualize_route_on_parking_grid, grid_list, start, route), repeats)
+    return results
+
+
+def render(visualize, *args):
+    """
+    Run a visualization function and draw its figure off-screen.
+
+    :param visualize: Function from visualizations
+    :param args: Arguments for the function
+    """
+    import matplotlib.pyplot as plt
+    visualize(*args)
+    plt.gcf().canvas.draw()
+    plt.close("all")
+
+
+def compare(results, baseline, threshold):
+    """
+    Find benchmarks whose median time grew beyond the allowed ratio.
+
+    :param results: Results of this run
+    :param baseline: Results of the baseline run
+    :param threshold: Largest allowed ratio of current to baseline median
+    :return: List of (name, baseline seconds, current seconds, ratio)
+    """
+    regressions = []
+    for name, timing in sorted(results.items()):
+        if name not in baseline:
+            continue
+        before = baseline[name]["median"]
+        ratio = timing["median"] / before if before > 0 else float("inf")
+        if ratio > threshold:
+            regressions.append((name, before, timing["median"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000],
+                        help="Rows and columns of the benchmark grids")
+    parser.add_argument("--occupancies", type=float, nargs="+", default=[0.3, 0.9, 0.99],
+                        help="Occupied fractions of the benchmark grids")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--visualize-max", type=int, default=50,
+                        help="Largest grid size to benchmark visualization on")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results as JSON to this file instead of stdout")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Fail when a median time exceeds the baseline by this ratio")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "seed": args.seed,
+            "repeats": args.repeats,
+        },
+        "results": run_suite(args.sizes, args.occupancies, args.repeats, args.visualize_max, args.seed),
+    }
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        regressions = compare(report["results"], baseline, args.threshold)
+        for name, before, after, ratio in regressions:
+            print(f"REGRESSION {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms ({ratio:.2f}x)",
+                  file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.2f}x of {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,87 +1,304 @@
 import numpy as np
-from typing import List, Tuple
-from collections import deque
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+from collections import OrderedDict
 import random
+import time
+
+from bitset import PackedBits
+
+# Progress callback: receives the number of cells expanded so far, returns False to cancel
+ProgressCallback = Callable[[int], Optional[bool]]
+
+
+class SearchCancelled(Exception):
+    """
+    Raised when a progress callback cancels a running search.
+    """
+
+
+class SearchStats:
+    def __init__(self, operation: str):
+        """
+        Counters and phase timings of one query, handed to the finder's metrics sink.
+        
+        :param operation: Name of the finder method that ran the query
+        """
+        self.operation = operation
+        self.nodes_expanded = 0
+        self.max_queue_size = 0
+        self.visited_size = 0
+        self.cache_hit = False
+        self.phases: Dict[str, float] = {}
+        self._lap_started = time.perf_counter()
+    
+    def lap(self, phase: str):
+        """
+        Charge the time since the previous lap to a phase.
+        
+        :param phase: Phase name, for example "validation", "search" or "route"
+        """
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._lap_started
+        self._lap_started = now
+    
+    @property
+    def total_time(self) -> float:
+        return sum(self.phases.values())
+    
+    def as_dict(self) -> dict:
+        """
+        Get the statistics as a plain dict, for logging or JSON output.
+        
+        :return: Dict of the counters, phase times in seconds and total time
+        """
+        return {"operation": self.operation, "nodes_expanded": self.nodes_expanded,
+                "max_queue_size": self.max_queue_size, "visited_size": self.visited_size,
+                "cache_hit": self.cache_hit, "phases": dict(self.phases), "total_time": self.total_time}
+
+
+# Metrics sink: receives the statistics of every instrumented query
+MetricsSink = Callable[[SearchStats], None]
+
 
 class ParkingSpotFinder:
-    def __init__(self, parking_grid: List[List[int]]):
+    def __init__(self, parking_grid: Union[List[List[int]], np.ndarray],
+                 seed: Optional[int] = None, cache_size: int = 256, packed: bool = False,
+                 metrics: Optional[MetricsSink] = None, free_index: bool = False,
+                 result_cache=None):
         """
         Initialize the parking spot finder with a 2D grid.
         
-        :param parking_grid: 2D list representing the parking area
+        :param parking_grid: 2D list or NumPy array representing the parking area
         0 represents an empty spot, 1 represents an occupied spot
+        :param seed: Seed for the exploration order. None shuffles the directions
+        on every search; with a seed, one order is drawn from random.Random(seed)
+        and used for every search, so identical queries give identical results
+        :param cache_size: Number of closest-spot results memoized when a seed is
+        given, 0 disables the cache
+        :param packed: Store the grid and the visited maps of the searches at one
+        bit per cell instead of one byte, for very large lots
+        :param metrics: Optional sink called with the SearchStats of every query;
+        None disables instrumentation. Can also be set later through `metrics`
+        :param free_index: Keep a FreeSpotIndex of empty-spot counts per block and
+        answer find_closest_parking_spots from it, skipping fully occupied
+        regions instead of flooding them; suited to lots with few vacancies
+        :param result_cache: Optional result_cache.ResultCache consulted before
+        closest-spot and route searches; it can be shared between finders and,
+        when backed by a file, between processes
         """
 
-        # Validate input grid
-        check_cols = len(set(len(row) for row in parking_grid))
-        if check_cols != 1:
-            raise ValueError("Invalid parking grid: Rows have different lengths")
+        # Validate input grid; ndarrays are used as-is, nested lists are
+        # packed row by row into bytes
+        if isinstance(parking_grid, np.ndarray):
+            cells = parking_grid
+        else:
+            check_cols = len(set(len(row) for row in parking_grid))
+            if check_cols != 1:
+                raise ValueError("Invalid parking grid: Rows have different lengths")
+            cells = None
+            # bytes() of an ndarray row copies its memory rather than its
+            # values, so only plain list or tuple rows take the bytes path
+            if all(isinstance(row, (list, tuple)) for row in parking_grid):
+                try:
+                    raw = b"".join(map(bytes, parking_grid))
+                    cells = np.frombuffer(raw, dtype=np.uint8).reshape(len(parking_grid), -1)
+                except (TypeError, ValueError):
+                    # Non-integer or out-of-range values, the value check below reports them
+                    cells = None
+            if cells is None or cells.shape[1] != len(parking_grid[0]):
+                cells = np.asarray(parking_grid)
+        
+        if cells.ndim != 2 or cells.size == 0:
+            raise ValueError("Invalid parking grid: Expected a non-empty 2D grid")
+        
+        self.rows, self.cols = cells.shape
+        self.packed = bool(packed)
+        
+        if packed:
+            self._init_packed(cells)
+        else:
+            # Check grid values in one vectorized pass
+            if not ((cells == 0) | (cells == 1)).all():
+                raise ValueError("Invalid parking grid: Values should be 0 or 1")
+            
+            # Copy the grid into a uint8 buffer with a one-cell border on every
+            # side, so neighbors of any in-grid cell are always valid indices
+            self._width = self.cols + 2
+            padded = np.ones((self.rows + 2, self._width), dtype=np.uint8)
+            padded[1:-1, 1:-1] = cells
+            
+            # `_grid` is a read-only view into the padded buffer, `_cells` the
+            # flat byte-level view of the same memory used by the search loops;
+            # every write goes through set_occupied
+            self._grid = padded[1:-1, 1:-1]
+            self._grid.flags.writeable = False
+            self._cells = memoryview(padded).cast('B')
+        
+        # Flat-index offsets for (up, right, down, left)
+        self._offsets = {(-1, 0): -self._width, (0, 1): 1,
+                         (1, 0): self._width, (0, -1): -1}
         
-        # Check grid values
-        for row in parking_grid:
-            for val in row:
-                if val not in (0, 1):
-                    raise ValueError("Invalid parking grid: Values should be 0 or 1")
+        # Bumped on every occupancy change; listeners are told about each one
+        self.version = 0
+        self._listeners = []
         
-        self.grid = parking_grid
-        self.rows = len(parking_grid)
-        self.cols = len(parking_grid[0])
+        # Cleared visited maps left by earlier searches
+        self._visited_pool = []
+        
+        # Distance field shared by batch queries, built on first use
+        self._distance_field = None
+        
+        # Index of empty spots per block, maintained by set_occupied
+        self._free_index = None
+        if free_index:
+            from free_spot_index import FreeSpotIndex
+            self._free_index = FreeSpotIndex(self)
+        
+        # Fixed exploration order and result cache for seeded searches
+        self.seed = seed
+        self._direction_order = None
+        if seed is not None:
+            self._direction_order = self._shuffled_offsets(random.Random(seed))
+        self._cache = OrderedDict()
+        self._cache_size = cache_size if seed is not None else 0
+        
+        # Results shared by every finder on the same cache, keyed by grid
+        # content; the fingerprint is computed on the first cached query
+        self.result_cache = result_cache
+        self._fingerprint = None
+        
+        # Instrumentation is off unless a sink is set
+        self.metrics = metrics
     
-    def find_closest_parking_spots(self, start: Tuple[int, int]) -> List[Tuple[int, int, int]]:
+    @property
+    def grid(self) -> np.ndarray:
+        """
+        The parking grid as a (rows, cols) uint8 array.
+        
+        This is a read-only view of the finder's buffer, or an unpacked copy
+        when packed; change occupancy with set_occupied.
+        """
+        if self.packed:
+            padded = np.unpackbits(self._packed, axis=1, bitorder='little')
+            return padded[1:-1, 1:self.cols + 1]
+        return self._grid
+    
+    def find_closest_parking_spots(self, start: Tuple[int, int],
+                                   progress: Optional[ProgressCallback] = None) -> List[Tuple[int, int, int]]:
         """
         Find all closest empty parking spots using Breadth-First Search.
         
+        Spots are listed in the order BFS reaches them. With a seed that order
+        is fixed, and results are memoized per (grid version, start). With a
+        free-spot index the same spots are found through it instead, sorted
+        by (row, col).
+        
         :param start: Starting coordinates (row, col)
+        :param progress: Optional callback invoked after each BFS level with the
+        number of cells expanded so far; returning False raises SearchCancelled
         :return: List of tuples (row, col, distance) of the closest empty spots
         """
+        stats = SearchStats("find_closest_parking_spots") if self.metrics is not None else None
+        
         # Validate start position
         if not self._is_valid_position(start[0], start[1]):
             raise ValueError("Invalid starting position")
+        if stats is not None:
+            stats.lap("validation")
         
-        # Directions for movement (up, right, down, left)
-        directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+        key = (self.version, start[0], start[1])
+        if self._cache_size:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                if stats is not None:
+                    stats.cache_hit = True
+                    self._report(stats, "cache")
+                return list(cached)
         
-        # Shuffle the directions randomly to change the order of exploration
-        random.shuffle(directions)
-
-        # Queue for BFS
-        queue = deque([(start[0], start[1], 0)])
+        result_key = None
+        if self.result_cache is not None:
+            result_key = self._result_key("closest/sorted" if self._free_index is not None
+                                          else f"closest/seed={self.seed}", start)
+            cached = self.result_cache.get(result_key)
+            if cached is not None:
+                if stats is not None:
+                    stats.cache_hit = True
+                    self._report(stats, "cache")
+                return list(cached)
         
-        # Tracking visited positions to avoid revisiting
-        visited = set([(start[0], start[1])])
+        if self._free_index is not None:
+            closest_spots = self._free_index.closest_spots(start)
+        else:
+            start_index = self._index(start[0], start[1])
+            spots, distance = self._search_closest(start_index, self._exploration_offsets(),
+                                                   progress=progress, stats=stats)
+            closest_spots = [self._coords(index) + (distance,) for index in spots]
         
-        # Store closest parking spots
-        closest_spots = []
-        min_distance = float('inf')
+        if self._cache_size:
+            self._cache[key] = tuple(closest_spots)
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        if result_key is not None:
+            self.result_cache.put(result_key, tuple(closest_spots))
+        if stats is not None:
+            self._report(stats, "search")
+        return closest_spots
+    
+    def find_closest_parking_spots_with_routes(self, start: Tuple[int, int],
+                                               progress: Optional[ProgressCallback] = None) -> "ParkingSearchResult":
+        """
+        Find all closest empty parking spots and keep the BFS tree to route to them.
         
-        while queue:
-            current_row, current_col, distance = queue.popleft()
-            
-            # If we've found spots and current distance is greater than min, stop searching
-            if closest_spots and distance > min_distance:
-                break
-            
-            # Check if current spot is empty
-            if self.grid[current_row][current_col] == 0:
-                # If this is a new minimum distance, clear previous spots
-                if distance < min_distance:
-                    closest_spots = [(current_row, current_col, distance)]
-                    min_distance = distance
-                # If this is at the same minimum distance, add to the list
-                elif distance == min_distance:
-                    closest_spots.append((current_row, current_col, distance))
-            
-            # Explore neighboring cells
-            for dx, dy in directions:
-                new_row, new_col = current_row + dx, current_col + dy
-                
-                # Check if new position is valid and not visited
-                if (self._is_valid_position(new_row, new_col) and 
-                    (new_row, new_col) not in visited):
-                    queue.append((new_row, new_col, distance + 1))
-                    visited.add((new_row, new_col))
+        A single BFS is run; routes to any of the closest spots are rebuilt
+        from its parent pointers on demand instead of searching again.
         
-        return closest_spots
+        :param start: Starting coordinates (row, col)
+        :param progress: Optional callback invoked after each BFS level with the
+        number of cells expanded so far; returning False raises SearchCancelled
+        :return: ParkingSearchResult with the closest spots and their routes
+        """
+        stats = SearchStats("find_closest_parking_spots_with_routes") if self.metrics is not None else None
+        
+        # Validate start position
+        if not self._is_valid_position(start[0], start[1]):
+            raise ValueError("Invalid starting position")
+        if stats is not None:
+            stats.lap("validation")
+        
+        # Parents are kept in a dict holding only the discovered cells, as the
+        # result keeps them after the search
+        start_index = self._index(start[0], start[1])
+        parents = {}
+        spots, distance = self._search_closest(start_index, self._exploration_offsets(), parents, progress, stats)
+        closest_spots = [self._coords(index) + (distance,) for index in spots]
+        if stats is not None:
+            self._report(stats, "search")
+        return ParkingSearchResult(self, start, closest_spots, parents)
+    
+    def find_closest_parking_spots_batch(self, starts: Iterable[Tuple[int, int]]) -> List[List[Tuple[int, int, int]]]:
+        """
+        Find all closest empty parking spots for many starting positions at once.
+        
+        The queries share one multi-source distance field from every empty
+        spot, built on the first call and kept up to date by set_occupied, so
+        each start only visits cells on its shortest paths to the closest spots.
+        
+        :param starts: Iterable of starting coordinates (row, col)
+        :return: One list of tuples (row, col, distance) per start, sorted by (row, col)
+        """
+        starts = list(starts)
+        for start in starts:
+            if not self._is_valid_position(start[0], start[1]):
+                raise ValueError(f"Invalid starting position: {start}")
+        
+        if self._distance_field is None:
+            from distance_field import DistanceField
+            self._distance_field = DistanceField(self)
+        
+        closest_spots = self._distance_field.closest_spots
+        return [closest_spots(start) for start in starts]
     
     def find_route_to_parking_spot(self, start: Tuple[int, int], target: Tuple[int, int]) -> List[Tuple[int, int]]:
         """
@@ -91,34 +308,410 @@ class ParkingSpotFinder:
         :param target: Target parking spot coordinates (row, col)
         :return: List of tuples representing the route (row, col)
         """
+        stats = SearchStats("find_route_to_parking_spot") if self.metrics is not None else None
+        
         if not (self._is_valid_position(*start) and self._is_valid_position(*target)):
             raise ValueError("Invalid start or target position")
+        if stats is not None:
+            stats.lap("validation")
         
+        key = self._result_key("route", start, target) if self.result_cache is not None else None
+        if key is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                if stats is not None:
+                    stats.cache_hit = True
+                    self._report(stats, "cache")
+                return list(cached)
+        
+        route = self._search_route(start, target, stats)
+        if key is not None:
+            self.result_cache.put(key, tuple(route))
+        return route
+    
+    def _search_route(self, start: Tuple[int, int], target: Tuple[int, int],
+                      stats: Optional[SearchStats]) -> List[Tuple[int, int]]:
+        """
+        Run the BFS of find_route_to_parking_spot on validated positions.
+        
+        :param start: Starting coordinates (row, col)
+        :param target: Target parking spot coordinates (row, col)
+        :param stats: Statistics of the query, None when instrumentation is off
+        :return: List of tuples representing the route (row, col)
+        """
         # Directions for movement (up, right, down, left)
-        directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+        offsets = [self._offsets[direction] for direction in ((-1, 0), (0, 1), (1, 0), (0, -1))]
+        
+        start_index = self._index(start[0], start[1])
+        target_index = self._index(target[0], target[1])
+        if start_index == target_index:
+            if stats is not None:
+                stats.visited_size = stats.max_queue_size = 1
+                self._report(stats, "search")
+            return [target]
         
-        # Queue for BFS with path tracking
-        queue = deque([(start, [])])  # Each entry is (current_position, path_so_far)
-        visited = set([start])
+        # BFS one level at a time, keeping one parent pointer per cell instead
+        # of a path per entry. Levels are expanded in the same order as a FIFO
+        # queue would, so parents and routes are the same as with one.
+        # Parents start in a dict of discovered cells, so memory follows the
+        # search rather than the grid, packed or not; once the search covers
+        # a sizeable part of the grid they move to a flat array, which is
+        # then the smaller of the two
+        visited = self._acquire_visited()
+        visited[start_index] = 1
+        parents = {}
+        frontier = [start_index]
+        levels = [frontier]
+        expanded = largest = 1
         
-        while queue:
-            current, path = queue.popleft()
+        while frontier:
+            next_frontier = []
+            levels.append(next_frontier)
+            append = next_frontier.append
+            for current in frontier:
+                for offset in offsets:
+                    neighbor = current + offset
+                    if not visited[neighbor]:
+                        visited[neighbor] = 1
+                        parents[neighbor] = current
+                        append(neighbor)
             
-            # Check if we've reached the target
-            if current == target:
-                return path + [target]
+            # Stop at the level on which the target is discovered
+            if visited[target_index]:
+                if stats is not None:
+                    stats.nodes_expanded = expanded
+                    stats.visited_size = expanded + len(next_frontier)
+                    stats.max_queue_size = max(largest, len(next_frontier))
+                    stats.lap("search")
+                route = self._build_route(parents, start_index, target_index)
+                self._release_visited(visited, levels, expanded + len(next_frontier))
+                if stats is not None:
+                    self._report(stats, "route")
+                return route
             
-            for dx, dy in directions:
-                new_row, new_col = current[0] + dx, current[1] + dy
-                new_pos = (new_row, new_col)
-                
-                if self._is_valid_position(new_row, new_col) and new_pos not in visited:
-                    visited.add(new_pos)
-                    queue.append((new_pos, path + [current]))
+            if type(parents) is dict and len(parents) > len(visited) // 16:
+                parents = self._parent_array(parents)
+            
+            frontier = next_frontier
+            expanded += len(frontier)
+            largest = max(largest, len(frontier))
         
         # Return an empty path if no route is found
+        self._release_visited(visited, levels, expanded)
+        if stats is not None:
+            self._report(stats, "search")
         return []
     
+    def find_route_astar(self, start: Tuple[int, int], target: Tuple[int, int],
+                         avoid_occupied: bool = False) -> Tuple[List[Tuple[int, int]], int]:
+        """
+        Find the shortest route from the start to the target using A* search.
+        
+        The Manhattan distance to the target is the heuristic. Every move costs
+        1, so open cells are kept in buckets keyed by their estimated total
+        cost, and the search stops as soon as the target is expanded.
+        
+        :param start: Starting coordinates (row, col)
+        :param target: Target parking spot coordinates (row, col)
+        :param avoid_occupied: Treat occupied spots other than the start and target as impassable
+        :return: Tuple (route as a list of (row, col), number of expanded cells);
+        the route is empty if the target cannot be reached
+        """
+        stats = SearchStats("find_route_astar") if self.metrics is not None else None
+        
+        if not (self._is_valid_position(*start) and self._is_valid_position(*target)):
+            raise ValueError("Invalid start or target position")
+        if stats is not None:
+            stats.lap("validation")
+        
+        # Directions for movement (up, right, down, left)
+        offsets = [self._offsets[direction] for direction in ((-1, 0), (0, 1), (1, 0), (0, -1))]
+        
+        cells = self._cells
+        width = self._width
+        start_index = self._index(start[0], start[1])
+        target_index = self._index(target[0], target[1])
+        target_row, target_col = divmod(target_index, width)
+        
+        # Expanded cells, with the border pre-marked so it is never entered
+        closed = self._acquire_visited()
+        # Best known cost and parent of each reached cell; only reached cells
+        # are stored, so a search pruned toward the target stays cheap
+        costs = {start_index: 0}
+        parents = {}
+        
+        # Open cells bucketed by estimated total cost; each bucket is a stack
+        # so the most recently reached, deepest cells are expanded first
+        estimate = abs(start[0] - target[0]) + abs(start[1] - target[1])
+        buckets = {estimate: [start_index]}
+        expanded = 0
+        
+        while buckets:
+            estimate = min(buckets)
+            bucket = buckets.pop(estimate)
+            while bucket:
+                current = bucket.pop()
+                if closed[current]:
+                    continue
+                closed[current] = 1
+                expanded += 1
+                if stats is not None:
+                    # Open entries left; the buckets only span a few estimates
+                    open_size = len(bucket) + sum(map(len, buckets.values())) + 1
+                    stats.max_queue_size = max(stats.max_queue_size, open_size)
+                
+                # Stop as soon as the target is expanded
+                if current == target_index:
+                    if stats is not None:
+                        self._astar_stats(stats, expanded, costs)
+                        stats.lap("search")
+                    route = self._build_route(parents, start_index, target_index)
+                    self._release_visited(closed, (costs,), len(costs))
+                    if stats is not None:
+                        self._report(stats, "route")
+                    return route, expanded
+                
+                cost = costs[current]
+                for offset in offsets:
+                    neighbor = current + offset
+                    if closed[neighbor]:
+                        continue
+                    if avoid_occupied and cells[neighbor] and neighbor != target_index:
+                        continue
+                    known = costs.get(neighbor)
+                    if known is not None and known <= cost + 1:
+                        continue
+                    
+                    costs[neighbor] = cost + 1
+                    parents[neighbor] = current
+                    row, col = divmod(neighbor, width)
+                    neighbor_estimate = cost + 1 + abs(row - target_row) + abs(col - target_col)
+                    if neighbor_estimate == estimate:
+                        bucket.append(neighbor)
+                    else:
+                        buckets.setdefault(neighbor_estimate, []).append(neighbor)
+        
+        # Return an empty path if no route is found
+        self._release_visited(closed, (costs,), len(costs))
+        if stats is not None:
+            self._astar_stats(stats, expanded, costs)
+            self._report(stats, "search")
+        return [], expanded
+    
+    def set_occupied(self, row: int, col: int, occupied: bool):
+        """
+        Change the occupancy of a single spot.
+        
+        :param row: Row index
+        :param col: Column index
+        :param occupied: True to mark the spot occupied, False to mark it empty
+        """
+        if not self._is_valid_position(row, col):
+            raise ValueError("Invalid position")
+        
+        index = self._index(row, col)
+        value = 1 if occupied else 0
+        if self._cells[index] == value:
+            return
+        
+        self._cells[index] = value
+        self.version += 1
+        self._cache.clear()
+        for listener in self._listeners:
+            listener(row, col, bool(occupied))
+    
+    def add_listener(self, listener: Callable[[int, int, bool], None]):
+        """
+        Register a callback invoked after every occupancy change.
+        
+        :param listener: Callable taking (row, col, occupied)
+        """
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[int, int, bool], None]):
+        """
+        Unregister a callback added with add_listener.
+        
+        :param listener: Previously registered callable
+        """
+        self._listeners.remove(listener)
+    
+    def _result_key(self, query: str, *cells: Tuple[int, int]) -> str:
+        """
+        Build the result cache key of a query on the current grid.
+        
+        :param query: Query type, including anything else the result depends on
+        :param cells: Cells of the query, such as the start and target
+        :return: Key made of the grid fingerprint, the query type and the cells
+        """
+        if self._fingerprint is None:
+            from result_cache import GridFingerprint
+            self._fingerprint = GridFingerprint(self)
+        return ":".join([self._fingerprint.digest, query] + [f"{row},{col}" for row, col in cells])
+    
+    def _exploration_offsets(self) -> List[int]:
+        """
+        Get the neighbor offsets in the order the next search explores them.
+        
+        :return: List of flat-index offsets
+        """
+        if self._direction_order is not None:
+            return self._direction_order
+        return self._shuffled_offsets(random)
+    
+    def _shuffled_offsets(self, rng) -> List[int]:
+        """
+        Get the neighbor offsets in a random exploration order.
+        
+        :param rng: random.Random instance, or the random module itself
+        :return: List of flat-index offsets
+        """
+        # Directions for movement (up, right, down, left)
+        directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+        
+        # Shuffle the directions randomly to change the order of exploration
+        rng.shuffle(directions)
+        return [self._offsets[direction] for direction in directions]
+    
+    def _search_closest(self, start_index: int, offsets: List[int],
+                        parents: Optional[Dict[int, int]] = None,
+                        progress: Optional[ProgressCallback] = None,
+                        stats: Optional[SearchStats] = None) -> Tuple[List[int], int]:
+        """
+        Run BFS level by level until the first level containing empty spots.
+        
+        :param start_index: Flat index of the starting cell
+        :param offsets: Neighbor offsets in exploration order
+        :param parents: Optional dict receiving the parent of each discovered cell
+        :param progress: Optional callback invoked after each level with the number
+        of cells expanded so far; returning False raises SearchCancelled
+        :param stats: Optional statistics receiving the search counters
+        :return: Tuple (flat indices of the closest empty spots, their distance)
+        """
+        cells = self._cells
+        
+        # Tracking visited positions to avoid revisiting; the border is
+        # pre-marked so it is never entered
+        visited = self._acquire_visited()
+        visited[start_index] = 1
+        
+        # BFS one distance level at a time; the levels are kept to clear
+        # the visited map afterwards
+        frontier = [start_index]
+        levels = [frontier]
+        distance = 0
+        expanded = 0
+        largest = 1
+        
+        while frontier:
+            # Every empty spot on the first level that has any is a closest spot
+            spots = [index for index in frontier if not cells[index]]
+            if spots:
+                if stats is not None:
+                    stats.nodes_expanded = expanded
+                    stats.visited_size = expanded + len(frontier)
+                    stats.max_queue_size = largest
+                self._release_visited(visited, levels, expanded + len(frontier))
+                return spots, distance
+            
+            # Explore neighboring cells
+            next_frontier = []
+            append = next_frontier.append
+            if self.packed and parents is None:
+                # Same loop with the bit test inlined on the packed bytes
+                bits = visited.bits
+                for index in frontier:
+                    for offset in offsets:
+                        neighbor = index + offset
+                        byte = bits[neighbor >> 3]
+                        mask = 1 << (neighbor & 7)
+                        if not byte & mask:
+                            bits[neighbor >> 3] = byte | mask
+                            append(neighbor)
+            elif parents is None:
+                for index in frontier:
+                    for offset in offsets:
+                        neighbor = index + offset
+                        if not visited[neighbor]:
+                            visited[neighbor] = 1
+                            append(neighbor)
+            else:
+                for index in frontier:
+                    for offset in offsets:
+                        neighbor = index + offset
+                        if not visited[neighbor]:
+                            visited[neighbor] = 1
+                            parents[neighbor] = index
+                            append(neighbor)
+            
+            expanded += len(frontier)
+            if progress is not None and progress(expanded) is False:
+                raise SearchCancelled()
+            
+            frontier = next_frontier
+            levels.append(frontier)
+            distance += 1
+            largest = max(largest, len(frontier))
+        
+        if stats is not None:
+            stats.nodes_expanded = stats.visited_size = expanded
+            stats.max_queue_size = largest
+        self._release_visited(visited, levels, expanded)
+        return [], 0
+    
+    def _report(self, stats: SearchStats, phase: str):
+        """
+        Close the last phase of a query and hand its statistics to the metrics sink.
+        
+        :param stats: Statistics of the query
+        :param phase: Name of the phase that just ended
+        """
+        stats.lap(phase)
+        if self.metrics is not None:
+            self.metrics(stats)
+    
+    def _astar_stats(self, stats: SearchStats, expanded: int, costs: Dict[int, int]):
+        """
+        Fill in the counters of an A* search.
+        
+        :param stats: Statistics of the query
+        :param expanded: Number of expanded cells
+        :param costs: Cost of every cell reached by the search
+        """
+        stats.nodes_expanded = expanded
+        stats.visited_size = len(costs)
+    
+    def _parent_array(self, parents: Dict[int, int]) -> array:
+        """
+        Move parent pointers from a dict into a flat array over the padded buffer.
+        
+        :param parents: Parent of each discovered cell, by flat index
+        :return: Flat 8-byte array holding the same parents
+        """
+        # Repeating a one-item array avoids a temporary zero buffer of the same size
+        flat = array('q', [0]) * len(self._cells)
+        for index, parent in parents.items():
+            flat[index] = parent
+        return flat
+    
+    def _build_route(self, parents: Union[array, Dict[int, int]],
+                     start_index: int, target_index: int) -> List[Tuple[int, int]]:
+        """
+        Rebuild a route by following parent pointers back from the target.
+        
+        :param parents: Flat array or dict with the parent of each discovered cell
+        :param start_index: Flat index of the starting cell
+        :param target_index: Flat index of the target cell
+        :return: List of tuples representing the route (row, col)
+        """
+        route = [target_index]
+        index = target_index
+        while index != start_index:
+            index = parents[index]
+            route.append(index)
+        route.reverse()
+        return [self._coords(index) for index in route]
+    
     def _is_valid_position(self, row: int, col: int) -> bool:
         """
         Check if the given position is within the grid bounds.
@@ -128,4 +721,154 @@ class ParkingSpotFinder:
         :return: Boolean indicating if position is valid
         """
         return (0 <= row < self.rows and 
-                0 <= col < self.cols)
\ No newline at end of file
+                0 <= col < self.cols)
+    
+    def _index(self, row: int, col: int) -> int:
+        """
+        Convert grid coordinates to a flat index into the padded buffer.
+        
+        :param row: Row index
+        :param col: Column index
+        :return: Flat index of the cell
+        """
+        return (row + 1) * self._width + col + 1
+    
+    def _coords(self, index: int) -> Tuple[int, int]:
+        """
+        Convert a flat index into the padded buffer back to grid coordinates.
+        
+        :param index: Flat index of the cell
+        :return: Tuple (row, col)
+        """
+        row, col = divmod(index, self._width)
+        return (row - 1, col - 1)
+    
+    def _init_packed(self, cells: np.ndarray):
+        """
+        Build the bit-packed padded grid, validating and packing a few rows at a time.
+        
+        Rows are padded to a whole number of bytes so every row starts on a
+        byte boundary; the padding columns are border cells.
+        
+        :param cells: 2D array of grid values
+        """
+        self._width = -(-(self.cols + 2) // 8) * 8
+        row_bytes = self._width // 8
+        packed = np.full((self.rows + 2, row_bytes), 0xFF, dtype=np.uint8)
+        
+        chunk_rows = max(1, (1 << 20) // self._width)
+        block = np.ones((chunk_rows, self._width), dtype=np.uint8)
+        for top in range(0, self.rows, chunk_rows):
+            chunk = cells[top:top + chunk_rows]
+            if not ((chunk == 0) | (chunk == 1)).all():
+                raise ValueError("Invalid parking grid: Values should be 0 or 1")
+            block[:len(chunk), 1:self.cols + 1] = chunk
+            packed[top + 1:top + 1 + len(chunk)] = np.packbits(block[:len(chunk)], axis=1, bitorder='little')
+        
+        self._packed = packed
+        self._cells = PackedBits(packed.size * 8, memoryview(packed).cast('B'))
+        
+        # Visited maps start as the border pattern: full first and last rows,
+        # and the first column plus the padding columns of every other row
+        border_row = np.ones(self._width, dtype=np.uint8)
+        border_row[1:self.cols + 1] = 0
+        row_pattern = np.packbits(border_row, bitorder='little').tobytes()
+        full_row = b"\xff" * row_bytes
+        self._visited_template = full_row + row_pattern * self.rows + full_row
+    
+    def _acquire_visited(self) -> Union[bytearray, PackedBits]:
+        """
+        Take a cleared visited map from the finder's pool, or create one.
+        
+        Maps are reused so a search that ends near its start costs only the
+        cells it touched, not a pass over the whole grid. Each search holds
+        its own map, so concurrent searches on one finder stay independent.
+        
+        :return: Visited map with only the border marked
+        """
+        try:
+            return self._visited_pool.pop()
+        except IndexError:
+            return self._new_visited()
+    
+    def _release_visited(self, visited: Union[bytearray, PackedBits], levels: Iterable[Iterable[int]], count: int):
+        """
+        Clear the cells a search marked and return its visited map to the pool.
+        
+        :param visited: Map taken with _acquire_visited
+        :param levels: Groups of flat indices covering every cell the search marked
+        :param count: Number of marked cells; a map marked over a large part of
+        the grid is dropped instead, as a fresh one is cheaper than clearing it
+        """
+        if count > len(visited) // 16:
+            return
+        for level in levels:
+            for index in level:
+                visited[index] = 0
+        self._visited_pool.append(visited)
+    
+    def _new_visited(self) -> Union[bytearray, PackedBits]:
+        """
+        Create a visited map over the padded buffer with the border marked.
+        
+        :return: Bytearray, or PackedBits when packed, with 1 for every border
+        cell and 0 elsewhere
+        """
+        if self.packed:
+            return PackedBits(len(self._cells), bytearray(self._visited_template))
+        
+        width = self._width
+        height = self.rows + 2
+        visited = bytearray(width * height)
+        visited[:width] = b"\x01" * width
+        visited[-width:] = b"\x01" * width
+        visited[::width] = b"\x01" * height
+        visited[width - 1::width] = b"\x01" * height
+        return visited
+
+
+class ParkingSearchResult:
+    def __init__(self, finder: ParkingSpotFinder, start: Tuple[int, int],
+                 closest_spots: List[Tuple[int, int, int]], parents: Dict[int, int]):
+        """
+        Closest parking spots from one BFS together with its parent-pointer tree.
+        
+        :param finder: ParkingSpotFinder that ran the search
+        :param start: Starting coordinates (row, col)
+        :param closest_spots: List of tuples (row, col, distance) of the closest empty spots
+        :param parents: Parent of each discovered cell, by flat index
+        """
+        self.finder = finder
+        self.start = start
+        self.closest_spots = closest_spots
+        self._parents = parents
+        self._spot_indices = set(finder._index(row, col) for row, col, _ in closest_spots)
+    
+    def route_to(self, spot: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Rebuild the route from the start to one of the closest spots.
+        
+        :param spot: Coordinates (row, col) of one of the closest spots
+        :return: List of tuples representing the route (row, col)
+        """
+        spot_index = self.finder._index(spot[0], spot[1])
+        if spot_index not in self._spot_indices:
+            raise ValueError("Spot is not one of the closest parking spots")
+        
+        start_index = self.finder._index(self.start[0], self.start[1])
+        return self.finder._build_route(self._parents, start_index, spot_index)
+    
+    def routes(self) -> List[List[Tuple[int, int]]]:
+        """
+        Rebuild the routes to all of the closest spots.
+        
+        :return: List of routes in the same order as closest_spots
+        """
+        return [self.route_to(spot[:2]) for spot in self.closest_spots]
+
+
+if __name__ == "__main__":
+    # python -m bfs_parking: the headless command line interface
+    import sys
+    from parking_cli import main
+    sys.exit(main())
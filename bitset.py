@@ -0,0 +1,31 @@
+from typing import Optional, Union
+
+Buffer = Union[bytearray, memoryview]
+
+
+class PackedBits:
+    def __init__(self, size: int, bits: Optional[Buffer] = None):
+        """
+        Fixed-size array of bits stored eight to a byte, least significant bit first.
+
+        :param size: Number of bits
+        :param bits: Writable byte buffer to use as storage, a zeroed one is allocated if omitted
+        """
+        if bits is None:
+            bits = bytearray((size + 7) // 8)
+        elif len(bits) * 8 < size:
+            raise ValueError("Bit buffer is too small")
+        self.size = size
+        self.bits = bits
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> int:
+        return (self.bits[index >> 3] >> (index & 7)) & 1
+
+    def __setitem__(self, index: int, value: int):
+        if value:
+            self.bits[index >> 3] |= 1 << (index & 7)
+        else:
+            self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
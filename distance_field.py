@@ -0,0 +1,227 @@
+import heapq
+import numpy as np
+from typing import List, Optional, Tuple
+from bfs_parking import ParkingSpotFinder
+
+# Distance stored for cells with no empty spot anywhere in the grid
+UNREACHABLE = 2 ** 30
+
+# Distance stored for the padding border around the grid
+BORDER = -1
+
+
+class DistanceField:
+    def __init__(self, finder: ParkingSpotFinder):
+        """
+        Multi-source distance field from every empty spot of a parking grid.
+
+        Answers the distance to, and one coordinate of, the nearest empty
+        spot for any cell in O(1). The field follows occupancy changes made
+        through finder.set_occupied and repairs only the cells they affect.
+
+        :param finder: ParkingSpotFinder whose grid the field is built on
+        """
+        self.finder = finder
+
+        # Distances and nearest-spot labels over the finder's padded layout
+        height, width = finder.rows + 2, finder._width
+        self.distances = np.full((height, width), BORDER, dtype=np.int32)
+        self.labels = np.full((height, width), -1, dtype=np.int64)
+        self._build()
+
+        # Flat views used by the incremental repair loops
+        self._distances = memoryview(self.distances).cast('B').cast('i')
+        self._labels = memoryview(self.labels).cast('B').cast('q')
+        self._neighbor_offsets = (-width, 1, width, -1)
+
+        finder.add_listener(self._on_occupancy_change)
+
+    def distance(self, row: int, col: int) -> Optional[int]:
+        """
+        Get the distance from a cell to its nearest empty spot.
+
+        :param row: Row index
+        :param col: Column index
+        :return: Distance, or None if the grid has no empty spot
+        """
+        if not self.finder._is_valid_position(row, col):
+            raise ValueError("Invalid position")
+
+        distance = self._distances[self.finder._index(row, col)]
+        return None if distance == UNREACHABLE else distance
+
+    def nearest_spot(self, row: int, col: int) -> Optional[Tuple[int, int, int]]:
+        """
+        Get one nearest empty spot for a cell.
+
+        :param row: Row index
+        :param col: Column index
+        :return: Tuple (row, col, distance), or None if the grid has no empty spot
+        """
+        distance = self.distance(row, col)
+        if distance is None:
+            return None
+
+        label = self._labels[self.finder._index(row, col)]
+        return self.finder._coords(label) + (distance,)
+
+    def closest_spots(self, start: Tuple[int, int]) -> List[Tuple[int, int, int]]:
+        """
+        Get all closest empty spots for a cell, like find_closest_parking_spots.
+
+        Only cells on shortest paths to a closest spot are visited, by
+        descending the field one unit of distance per step.
+
+        :param start: Starting coordinates (row, col)
+        :return: List of tuples (row, col, distance) sorted by (row, col)
+        """
+        if not self.finder._is_valid_position(start[0], start[1]):
+            raise ValueError("Invalid starting position")
+
+        distances = self._distances
+        start_index = self.finder._index(start[0], start[1])
+        distance = distances[start_index]
+        if distance == UNREACHABLE:
+            return []
+
+        # Every cell one step closer to an empty spot lies on a shortest path
+        frontier = {start_index}
+        for level in range(distance - 1, -1, -1):
+            frontier = {index + offset
+                        for index in frontier
+                        for offset in self._neighbor_offsets
+                        if distances[index + offset] == level}
+
+        return [self.finder._coords(index) + (distance,) for index in sorted(frontier)]
+
+    def detach(self):
+        """
+        Stop following occupancy changes of the finder.
+        """
+        self.finder.remove_listener(self._on_occupancy_change)
+
+    def _build(self):
+        """
+        Compute the whole field with vectorized sweeps.
+
+        Every in-grid cell is drivable, so the BFS distance to the nearest
+        empty spot is its Manhattan distance. That transform separates into a
+        forward and backward sweep down the rows followed by the same along
+        the columns, each step being a NumPy operation over a full row or column.
+        """
+        finder = self.finder
+        rows, cols, width = finder.rows, finder.cols, finder._width
+
+        free = finder.grid == 0
+        distances = np.where(free, 0, UNREACHABLE).astype(np.int32)
+        flat_index = (np.arange(1, rows + 1)[:, None] * width + np.arange(1, cols + 1)[None, :])
+        labels = np.where(free, flat_index, -1)
+
+        def relax(target, source):
+            candidate = distances[source] + 1
+            closer = candidate < distances[target]
+            distances[target] = np.where(closer, candidate, distances[target])
+            labels[target] = np.where(closer, labels[source], labels[target])
+
+        for row in range(1, rows):
+            relax(row, row - 1)
+        for row in range(rows - 2, -1, -1):
+            relax(row, row + 1)
+        for col in range(1, cols):
+            relax((slice(None), col), (slice(None), col - 1))
+        for col in range(cols - 2, -1, -1):
+            relax((slice(None), col), (slice(None), col + 1))
+
+        self.distances[1:rows + 1, 1:cols + 1] = distances
+        self.labels[1:rows + 1, 1:cols + 1] = labels
+
+    def _on_occupancy_change(self, row: int, col: int, occupied: bool):
+        """
+        Repair the field after a single spot changed occupancy.
+
+        :param row: Row index
+        :param col: Column index
+        :param occupied: New occupancy of the spot
+        """
+        index = self.finder._index(row, col)
+        if occupied:
+            self._remove_source(index)
+        else:
+            self._add_source(index)
+
+    def _add_source(self, index: int):
+        """
+        Spread a newly empty spot outwards while it is strictly closer.
+
+        :param index: Flat index of the spot
+        """
+        distances, labels = self._distances, self._labels
+        distances[index] = 0
+        labels[index] = index
+
+        frontier = [index]
+        distance = 0
+        while frontier:
+            distance += 1
+            next_frontier = []
+            for current in frontier:
+                for offset in self._neighbor_offsets:
+                    neighbor = current + offset
+                    if distance < distances[neighbor]:
+                        distances[neighbor] = distance
+                        labels[neighbor] = index
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+
+    def _remove_source(self, index: int):
+        """
+        Recompute the cells whose nearest spot was a now occupied spot.
+
+        Labels are always copied from an adjacent cell one step closer to the
+        spot, so the cells labelled with it form a connected region around it.
+        Only that region is reset and refilled from its boundary.
+
+        :param index: Flat index of the spot
+        """
+        distances, labels = self._distances, self._labels
+        offsets = self._neighbor_offsets
+
+        # Collect and reset the region that relied on the removed spot
+        region = [index]
+        labels[index] = -1
+        for current in region:
+            for offset in offsets:
+                neighbor = current + offset
+                if labels[neighbor] == index:
+                    labels[neighbor] = -1
+                    region.append(neighbor)
+        for current in region:
+            distances[current] = UNREACHABLE
+
+        # Seed the region from neighbors that kept a valid nearest spot
+        heap = []
+        for current in region:
+            best, best_label = UNREACHABLE, -1
+            for offset in offsets:
+                neighbor = current + offset
+                candidate = distances[neighbor] + 1
+                if distances[neighbor] >= 0 and candidate < best:
+                    best, best_label = candidate, labels[neighbor]
+            if best < UNREACHABLE:
+                distances[current] = best
+                labels[current] = best_label
+                heap.append((best, current))
+        heapq.heapify(heap)
+
+        # Dijkstra restricted to cells that can still improve
+        while heap:
+            distance, current = heapq.heappop(heap)
+            if distance > distances[current]:
+                continue
+            label = labels[current]
+            for offset in offsets:
+                neighbor = current + offset
+                if distance + 1 < distances[neighbor]:
+                    distances[neighbor] = distance + 1
+                    labels[neighbor] = label
+                    heapq.heappush(heap, (distance + 1, neighbor))
@@ -0,0 +1,112 @@
+import heapq
+import numpy as np
+from typing import List, Tuple
+
+from bfs_parking import ParkingSpotFinder
+
+
+class FreeSpotIndex:
+    def __init__(self, finder: ParkingSpotFinder):
+        """
+        Pyramid of empty-spot counts over a parking grid, like a region quadtree.
+
+        Level k holds the number of empty spots in each 2^k x 2^k block, up
+        to a single block covering the whole grid. A nearest-spot query
+        descends only into blocks that contain empty spots, closest block
+        first, so fully occupied regions are skipped whole. The index follows
+        occupancy changes made through finder.set_occupied, updating one count
+        per level.
+
+        :param finder: ParkingSpotFinder whose grid the index is built on
+        """
+        self.finder = finder
+
+        counts = (finder.grid == 0).astype(np.int32)
+        self.levels = [counts]
+        while counts.shape != (1, 1):
+            # Pad odd sides with empty rows or columns, then sum 2x2 blocks
+            rows, cols = counts.shape
+            padded = np.zeros((rows + rows % 2, cols + cols % 2), dtype=np.int32)
+            padded[:rows, :cols] = counts
+            counts = padded[0::2, 0::2] + padded[1::2, 0::2] + padded[0::2, 1::2] + padded[1::2, 1::2]
+            self.levels.append(counts)
+
+        finder.add_listener(self._on_occupancy_change)
+
+    @property
+    def free_count(self) -> int:
+        return int(self.levels[-1][0, 0])
+
+    def closest_spots(self, start: Tuple[int, int]) -> List[Tuple[int, int, int]]:
+        """
+        Get all closest empty spots for a cell, like find_closest_parking_spots.
+
+        Blocks are visited in order of their Manhattan distance from the start,
+        a lower bound for every spot inside them. Every cell is drivable, so a
+        spot's search distance is its Manhattan distance, and the search ends
+        once no remaining block can hold a spot as close as the ones found.
+
+        :param start: Starting coordinates (row, col)
+        :return: List of tuples (row, col, distance) sorted by (row, col)
+        """
+        finder = self.finder
+        row, col = start
+        if not finder._is_valid_position(row, col):
+            raise ValueError("Invalid starting position")
+
+        levels = self.levels
+        rows, cols = finder.rows, finder.cols
+        top = len(levels) - 1
+        if not levels[top][0, 0]:
+            return []
+
+        best = None
+        spots = []
+        heap = [(0, top, 0, 0)]
+        while heap:
+            bound, level, block_row, block_col = heapq.heappop(heap)
+            if best is not None and bound > best:
+                break
+
+            if level == 0:
+                best = bound
+                spots.append((block_row, block_col, bound))
+                continue
+
+            # Open the up to four child blocks that hold empty spots
+            level -= 1
+            counts = levels[level]
+            size = 1 << level
+            for child_row in (2 * block_row, 2 * block_row + 1):
+                first_row = child_row * size
+                if first_row >= rows:
+                    continue
+                last_row = min(first_row + size, rows) - 1
+                row_gap = first_row - row if row < first_row else (row - last_row if row > last_row else 0)
+                for child_col in (2 * block_col, 2 * block_col + 1):
+                    first_col = child_col * size
+                    if first_col >= cols or not counts[child_row, child_col]:
+                        continue
+                    last_col = min(first_col + size, cols) - 1
+                    col_gap = first_col - col if col < first_col else (col - last_col if col > last_col else 0)
+                    heapq.heappush(heap, (row_gap + col_gap, level, child_row, child_col))
+
+        return sorted(spots)
+
+    def detach(self):
+        """
+        Stop following occupancy changes of the finder.
+        """
+        self.finder.remove_listener(self._on_occupancy_change)
+
+    def _on_occupancy_change(self, row: int, col: int, occupied: bool):
+        """
+        Update the count of every block containing a spot that changed occupancy.
+
+        :param row: Row index
+        :param col: Column index
+        :param occupied: New occupancy of the spot
+        """
+        delta = -1 if occupied else 1
+        for level, counts in enumerate(self.levels):
+            counts[row >> level, col >> level] += delta
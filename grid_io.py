@@ -0,0 +1,199 @@
+import itertools
+import os
+import struct
+from typing import Iterator, List, Union
+
+import numpy as np
+
+# Header of the bit-packed grid format: magic, rows, cols
+PACKED_MAGIC = b"PGRID1\0\0"
+PACKED_HEADER = struct.Struct("<8sQQ")
+
+Grid = Union[List[List[int]], np.ndarray]
+
+# Cells checked at a time when validating a memory-mapped grid
+VALIDATE_CHUNK_CELLS = 1 << 22
+
+
+def iter_csv_chunks(path: str, chunk_rows: int = 4096) -> Iterator[np.ndarray]:
+    """
+    Stream a parking grid CSV as blocks of rows.
+
+    Cells that are single 0/1 characters are parsed and validated with
+    vectorized byte operations; any other chunk falls back to np.loadtxt.
+
+    :param path: Path of the CSV file, one grid row per line, no header
+    :param chunk_rows: Number of grid rows per block
+    :return: Iterator of uint8 arrays of shape (rows in block, cols)
+    """
+    cols = None
+    with open(path, "rb") as csv_file:
+        while True:
+            lines = list(itertools.islice(csv_file, chunk_rows))
+            if not lines:
+                return
+
+            block = _parse_csv_lines(lines)
+            if block.size == 0:
+                continue
+            if cols is None:
+                cols = block.shape[1]
+            elif block.shape[1] != cols:
+                raise ValueError("Invalid parking grid: Rows have different lengths")
+            yield block
+
+
+def load_csv_grid(path: str, chunk_rows: int = 4096) -> np.ndarray:
+    """
+    Load a parking grid CSV into a uint8 array.
+
+    :param path: Path of the CSV file, one grid row per line, no header
+    :param chunk_rows: Number of grid rows parsed at a time
+    :return: 2D uint8 array, 0 for empty spots and 1 for occupied spots
+    """
+    blocks = list(iter_csv_chunks(path, chunk_rows))
+    if not blocks:
+        raise ValueError("Invalid parking grid: CSV file is empty")
+    return np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+
+
+def csv_to_npy(csv_path: str, npy_path: str, chunk_rows: int = 4096) -> np.ndarray:
+    """
+    Convert a parking grid CSV to .npy without holding the whole grid in memory.
+
+    :param csv_path: Path of the CSV file
+    :param npy_path: Path of the .npy file to write
+    :param chunk_rows: Number of grid rows parsed at a time
+    :return: Read-only memory map of the written grid
+    """
+    with open(csv_path, "rb") as csv_file:
+        rows = sum(1 for line in csv_file if line.strip())
+    if rows == 0:
+        raise ValueError("Invalid parking grid: CSV file is empty")
+
+    chunks = iter_csv_chunks(csv_path, chunk_rows)
+    first = next(chunks)
+    grid = np.lib.format.open_memmap(npy_path, mode="w+", dtype=np.uint8, shape=(rows, first.shape[1]))
+    grid[:len(first)] = first
+    row = len(first)
+    for block in chunks:
+        grid[row:row + len(block)] = block
+        row += len(block)
+    grid.flush()
+    del grid
+    return open_grid(npy_path)
+
+
+def save_grid(path: str, grid: Grid):
+    """
+    Save a parking grid as .npy, or bit-packed when the path ends in .pgrid.
+
+    :param path: Path of the file to write
+    :param grid: 2D list or NumPy array representing the parking area
+    """
+    # Stored as uint8 whatever the input dtype, the only type open_grid maps
+    cells = _validated(np.asarray(grid)).astype(np.uint8, copy=False)
+    if path.endswith(".pgrid"):
+        with open(path, "wb") as packed_file:
+            packed_file.write(PACKED_HEADER.pack(PACKED_MAGIC, *cells.shape))
+            packed_file.write(np.packbits(cells, axis=None, bitorder="little").tobytes())
+    else:
+        np.save(path, cells)
+
+
+def open_grid(path: str) -> np.ndarray:
+    """
+    Open a saved parking grid.
+
+    .npy files are memory-mapped read-only and share pages between
+    processes; their values are checked a few rows at a time, so opening
+    never holds more than one chunk in memory. .pgrid files keep one bit
+    per cell on disk and are unpacked on load. Anything else is read as CSV.
+
+    :param path: Path of a .npy, .pgrid or .csv file
+    :return: 2D uint8 array, 0 for empty spots and 1 for occupied spots
+    """
+    if path.endswith(".npy"):
+        grid = np.load(path, mmap_mode="r")
+        if grid.ndim != 2 or grid.dtype != np.uint8:
+            raise ValueError("Invalid parking grid: Expected a 2D uint8 array")
+        chunk_rows = max(1, VALIDATE_CHUNK_CELLS // max(1, grid.shape[1]))
+        for top in range(0, max(1, grid.shape[0]), chunk_rows):
+            _validated(grid[top:top + chunk_rows])
+        return grid
+
+    if path.endswith(".pgrid"):
+        return unpack_bits(*open_packed_grid(path))
+
+    return load_csv_grid(path)
+
+
+def open_packed_grid(path: str):
+    """
+    Memory-map the bits of a .pgrid file without unpacking them.
+
+    :param path: Path of the .pgrid file
+    :return: Tuple (uint8 memory map of the packed bits, rows, cols)
+    """
+    with open(path, "rb") as packed_file:
+        magic, rows, cols = PACKED_HEADER.unpack(packed_file.read(PACKED_HEADER.size))
+    if magic != PACKED_MAGIC:
+        raise ValueError(f"Not a packed parking grid: {path}")
+
+    size = (rows * cols + 7) // 8
+    if os.path.getsize(path) < PACKED_HEADER.size + size:
+        raise ValueError(f"Truncated packed parking grid: {path}")
+    bits = np.memmap(path, dtype=np.uint8, mode="r", offset=PACKED_HEADER.size, shape=(size,))
+    return bits, rows, cols
+
+
+def unpack_bits(bits: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    """
+    Expand packed occupancy bits to one uint8 per cell.
+
+    :param bits: Packed bits, least significant bit first
+    :param rows: Number of grid rows
+    :param cols: Number of grid columns
+    :return: 2D uint8 array of shape (rows, cols)
+    """
+    return np.unpackbits(bits, count=rows * cols, bitorder="little").reshape(rows, cols)
+
+
+def _parse_csv_lines(lines: List[bytes]) -> np.ndarray:
+    """
+    Parse CSV lines of a parking grid into a validated uint8 block.
+
+    :param lines: Raw lines of the CSV file
+    :return: uint8 array with one row per non-empty line
+    """
+    lines = [line for line in b"".join(lines).translate(None, b" \t\r").split(b"\n") if line]
+    if not lines:
+        return np.zeros((0, 0), dtype=np.uint8)
+
+    # Fast path: every cell is one character, so each row is "d,d,...,d"
+    width = len(lines[0])
+    if width % 2 == 1 and all(len(line) == width for line in lines):
+        block = np.frombuffer(b"".join(lines), dtype=np.uint8).reshape(len(lines), width)
+        if (block[:, 1::2] == ord(",")).all():
+            cells = block[:, ::2] - ord("0")
+            return _validated(cells)
+
+    try:
+        cells = np.loadtxt(lines, delimiter=",", ndmin=2)
+    except ValueError:
+        raise ValueError("Invalid parking grid: Rows have different lengths or non-numeric values")
+    return _validated(cells).astype(np.uint8)
+
+
+def _validated(cells: np.ndarray) -> np.ndarray:
+    """
+    Check that a grid is two-dimensional and holds only 0 and 1.
+
+    :param cells: Grid array
+    :return: The same array
+    """
+    if cells.ndim != 2 or cells.size == 0:
+        raise ValueError("Invalid parking grid: Expected a non-empty 2D grid")
+    if not ((cells == 0) | (cells == 1)).all():
+        raise ValueError("Invalid parking grid: Values should be 0 or 1")
+    return cells
@@ -0,0 +1,173 @@
+import heapq
+import numpy as np
+from typing import Dict, List, Sequence, Tuple, Union
+
+from bfs_parking import ParkingSpotFinder
+from distance_field import DistanceField
+
+Grid = Union[List[List[int]], np.ndarray]
+
+# A cell of the garage: (floor, row, col)
+Location = Tuple[int, int, int]
+
+# A ramp between two cells on different floors: (end, other end, length)
+Ramp = Tuple[Location, Location, int]
+
+
+class MultiLevelGarage:
+    def __init__(self, floors: Sequence[Grid], ramps: Sequence[Union[Ramp, Tuple[Location, Location]]]):
+        """
+        Parking garage of several floors connected by ramps.
+
+        Each floor is a grid searched like a single lot. Ramp ends are the
+        only way between floors, so a cross-floor search runs on the small
+        graph of ramp ends: distances between the ends on one floor are
+        precomputed, and the distance from any cell to its floor's nearest
+        empty spot is kept by a distance field per floor.
+
+        :param floors: One 2D grid per floor (0 for empty, 1 for occupied)
+        :param ramps: Ramps as (end, other end) or (end, other end, length),
+        each end being (floor, row, col); the default length is 1
+        """
+        if not floors:
+            raise ValueError("A garage needs at least one floor")
+
+        self.finders = [ParkingSpotFinder(floor) for floor in floors]
+        self.fields = [DistanceField(finder) for finder in self.finders]
+
+        # Ramp ends are the nodes of the abstract graph
+        self.nodes: List[Location] = []
+        self._node_ids: Dict[Location, int] = {}
+        self._ramp_edges: List[List[Tuple[int, int]]] = []
+        for ramp in ramps:
+            if len(ramp) == 2:
+                ramp = (ramp[0], ramp[1], 1)
+            end, other, length = ramp
+            if length < 1:
+                raise ValueError(f"Invalid ramp length: {ramp}")
+            if end[0] == other[0]:
+                raise ValueError(f"Ramp must connect two floors: {ramp}")
+            first, second = self._node(end), self._node(other)
+            self._ramp_edges[first].append((second, length))
+            self._ramp_edges[second].append((first, length))
+
+        # Ramp ends per floor and the distances between them
+        self._floor_nodes: List[np.ndarray] = []
+        self._floor_distances: List[np.ndarray] = []
+        for floor in range(len(self.finders)):
+            ids = np.array([node for node, location in enumerate(self.nodes) if location[0] == floor],
+                           dtype=np.int64)
+            cells = np.array([self.nodes[node][1:] for node in ids], dtype=np.int64).reshape(-1, 2)
+            self._floor_nodes.append(ids)
+            self._floor_distances.append(np.abs(cells[:, None, :] - cells[None, :, :]).sum(axis=2))
+
+    @property
+    def floor_count(self) -> int:
+        return len(self.finders)
+
+    def set_occupied(self, floor: int, row: int, col: int, occupied: bool):
+        """
+        Change the occupancy of a single spot.
+
+        :param floor: Floor index
+        :param row: Row index
+        :param col: Column index
+        :param occupied: True to mark the spot occupied, False to mark it empty
+        """
+        self._check_location((floor, row, col))
+        self.finders[floor].set_occupied(row, col, occupied)
+
+    def find_closest_parking_spots(self, start: Location) -> List[Tuple[int, int, int, int]]:
+        """
+        Find all closest empty parking spots on any floor.
+
+        Dijkstra runs over the ramp ends only. Each settled end offers its
+        floor's nearest spot as a candidate, and the search stops once no
+        end can beat the best candidate, so the cost depends on the number
+        of ramps rather than the number of cells.
+
+        :param start: Starting location (floor, row, col)
+        :return: List of tuples (floor, row, col, distance) sorted by location
+        """
+        floor, row, col = self._check_location(start)
+
+        # Distance of every entry point into a floor: the start and settled ramp ends
+        best = self._nearest_distance(floor, row, col)
+        entries = [(0, floor, row, col)]
+
+        distances = {}
+        heap = []
+        floor_nodes = self._floor_nodes[floor]
+        if len(floor_nodes):
+            cells = np.array([self.nodes[node][1:] for node in floor_nodes], dtype=np.int64)
+            for node, distance in zip(floor_nodes.tolist(),
+                                      (np.abs(cells[:, 0] - row) + np.abs(cells[:, 1] - col)).tolist()):
+                heap.append((distance, node))
+            heapq.heapify(heap)
+
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if node in distances:
+                continue
+            # Ties count too: an end at exactly the best distance may be an empty spot itself
+            if best is not None and distance > best:
+                break
+            distances[node] = distance
+
+            node_floor, node_row, node_col = self.nodes[node]
+            nearest = self._nearest_distance(node_floor, node_row, node_col)
+            if nearest is not None:
+                entries.append((distance, node_floor, node_row, node_col))
+                if best is None or distance + nearest < best:
+                    best = distance + nearest
+
+            # Up or down a ramp, or across the floor to another ramp end
+            for neighbor, length in self._ramp_edges[node]:
+                if neighbor not in distances:
+                    heapq.heappush(heap, (distance + length, neighbor))
+            ids = self._floor_nodes[node_floor]
+            row_distances = self._floor_distances[node_floor][np.searchsorted(ids, node)]
+            for neighbor, length in zip(ids.tolist(), row_distances.tolist()):
+                if neighbor not in distances:
+                    heapq.heappush(heap, (distance + length, neighbor))
+
+        if best is None:
+            return []
+
+        # Every closest spot is a closest spot of an entry on a shortest path to it
+        spots = set()
+        for distance, entry_floor, entry_row, entry_col in entries:
+            nearest = self._nearest_distance(entry_floor, entry_row, entry_col)
+            if nearest is not None and distance + nearest == best:
+                spots.update((entry_floor,) + spot[:2]
+                             for spot in self.fields[entry_floor].closest_spots((entry_row, entry_col)))
+        return [spot + (best,) for spot in sorted(spots)]
+
+    def _nearest_distance(self, floor: int, row: int, col: int):
+        return self.fields[floor].distance(row, col)
+
+    def _node(self, location: Location) -> int:
+        """
+        Get the abstract graph node of a ramp end, adding it if new.
+
+        :param location: Ramp end (floor, row, col)
+        :return: Node id
+        """
+        location = self._check_location(location)
+        if location not in self._node_ids:
+            self._node_ids[location] = len(self.nodes)
+            self.nodes.append(location)
+            self._ramp_edges.append([])
+        return self._node_ids[location]
+
+    def _check_location(self, location: Location) -> Location:
+        """
+        Validate a garage location.
+
+        :param location: (floor, row, col)
+        :return: The location as a tuple
+        """
+        floor, row, col = location
+        if not (0 <= floor < len(self.finders) and self.finders[floor]._is_valid_position(row, col)):
+            raise ValueError(f"Invalid garage location: {tuple(location)}")
+        return floor, row, col
@@ -0,0 +1,332 @@
+import asyncio
+import operator
+import numpy as np
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+from bfs_parking import ParkingSpotFinder
+
+# One sensor reading: (row, col, occupied)
+Event = Tuple[int, int, bool]
+
+# Subscriber callback: receives the start point and its new closest spots
+Subscriber = Callable[[Tuple[int, int], List[Tuple[int, int, int]]], None]
+
+# Handler of a malformed event line: receives the line and the parse error
+InvalidLineHandler = Callable[[str, ValueError], None]
+
+# Upper bound on start-by-changed-cell pairs compared in one NumPy operation
+PAIR_CHUNK = 1 << 22
+
+
+class OccupancyFeed:
+    def __init__(self, finder: ParkingSpotFinder, batch_size: int = 4096,
+                 max_delay: float = 0.05, max_pending: int = 65536):
+        """
+        Asyncio pipeline that applies streamed occupancy events to a finder.
+
+        Events are collected into batches of up to batch_size, or whatever
+        arrived within max_delay seconds of the first one. Repeated events for
+        the same spot within a batch are coalesced to the last one. After each
+        batch, subscribers are called only for start points whose closest
+        spots changed. Invalid events and failing callbacks are counted and
+        skipped, so one bad sensor reading never stops the pipeline.
+
+        :param finder: ParkingSpotFinder whose grid the events update
+        :param batch_size: Largest number of events applied at once
+        :param max_delay: Longest time in seconds an event waits for its batch to fill
+        :param max_pending: Queued events before producers wait (backpressure)
+        """
+        if batch_size < 1 or max_delay < 0:
+            raise ValueError("Batch size must be positive and the delay non-negative")
+
+        self.finder = finder
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.queue = asyncio.Queue(max_pending)
+
+        # Current answer and callbacks of every subscribed start point
+        self.answers: Dict[Tuple[int, int], List[Tuple[int, int, int]]] = {}
+        self.subscribers: Dict[Tuple[int, int], List[Subscriber]] = {}
+
+        # Counters for monitoring the pipeline
+        self.events_received = 0
+        self.cells_changed = 0
+        self.batches_applied = 0
+        self.notifications_sent = 0
+        self.events_rejected = 0
+        self.callback_errors = 0
+        self.last_error: Optional[Exception] = None
+
+    def subscribe(self, start: Tuple[int, int], callback: Subscriber) -> List[Tuple[int, int, int]]:
+        """
+        Get notified whenever the closest spots of a start point change.
+
+        :param start: Starting coordinates (row, col)
+        :param callback: Callable taking (start, closest_spots)
+        :return: Current closest spots of the start, sorted by (row, col)
+        """
+        start = tuple(start)
+        if start not in self.answers:
+            self.answers[start] = self.finder.find_closest_parking_spots_batch([start])[0]
+            self.subscribers[start] = []
+        self.subscribers[start].append(callback)
+        return list(self.answers[start])
+
+    def unsubscribe(self, start: Tuple[int, int], callback: Subscriber):
+        """
+        Stop notifying a callback registered with subscribe.
+
+        :param start: Starting coordinates (row, col) it was subscribed to
+        :param callback: Previously registered callable
+        """
+        start = tuple(start)
+        self.subscribers[start].remove(callback)
+        if not self.subscribers[start]:
+            del self.subscribers[start]
+            del self.answers[start]
+
+    async def put(self, row: int, col: int, occupied: bool):
+        """
+        Queue one occupancy event, waiting while the queue is full.
+
+        :param row: Row index
+        :param col: Column index
+        :param occupied: True if the spot became occupied, False if it became empty
+        """
+        await self.queue.put((row, col, occupied))
+
+    async def ingest(self, events: AsyncIterator[Event]):
+        """
+        Queue every event of an asynchronous source until it is exhausted.
+
+        :param events: Async iterator of (row, col, occupied) events
+        """
+        async for row, col, occupied in events:
+            await self.queue.put((row, col, occupied))
+
+    def reject_line(self, line: str, error: ValueError):
+        """
+        Count a malformed line of an event source, for the on_invalid
+        argument of stream_events and file_events.
+
+        :param line: Line that could not be parsed
+        :param error: Parse error
+        """
+        self.events_rejected += 1
+        self.last_error = error
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        """
+        Accept sensor connections sending one "row,col,occupied" line per event.
+
+        :param host: Address to listen on
+        :param port: Port to listen on, 0 picks a free one
+        :return: Started asyncio server
+        """
+        async def handle(reader, writer):
+            try:
+                await self.ingest(stream_events(reader, self.reject_line))
+            finally:
+                writer.close()
+
+        return await asyncio.start_server(handle, host, port)
+
+    async def run(self):
+        """
+        Apply queued events batch by batch until cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.batch_size:
+                # Take what is already queued without waiting
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            self.apply(batch)
+
+    def apply(self, events: Iterable[Event]) -> int:
+        """
+        Apply a batch of events and notify subscribers whose answer changed.
+
+        :param events: Iterable of (row, col, occupied) events, later ones win;
+        malformed or out-of-range events are skipped and counted in events_rejected
+        :return: Number of spots whose occupancy actually changed
+        """
+        finder = self.finder
+
+        # Coalesce repeated events for a spot to the last one
+        latest = {}
+        received = 0
+        for event in events:
+            received += 1
+            try:
+                row, col, occupied = event
+                # operator.index accepts Python and NumPy integers and rejects floats
+                row, col = operator.index(row), operator.index(col)
+                if not finder._is_valid_position(row, col):
+                    raise ValueError(f"Invalid position in occupancy event: {(row, col)}")
+            except (TypeError, ValueError) as error:
+                self.events_rejected += 1
+                self.last_error = error
+                continue
+            latest[(row, col)] = bool(occupied)
+
+        # set_occupied bumps the grid version only when the value changes
+        changed = []
+        for (row, col), occupied in latest.items():
+            version = finder.version
+            finder.set_occupied(row, col, occupied)
+            if finder.version != version:
+                changed.append((row, col))
+
+        self.events_received += received
+        self.cells_changed += len(changed)
+        self.batches_applied += 1
+        if changed and self.answers:
+            self._notify(self._affected_starts(changed))
+        return len(changed)
+
+    def _affected_starts(self, changed: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Find the subscribed start points whose answer a set of changed spots can alter.
+
+        A start's closest spots at distance d can only change through a spot
+        within Manhattan distance d of it: a closer spot that became empty, or
+        a spot at distance d that was added or removed. Other starts are skipped.
+
+        :param changed: Coordinates of the spots that changed occupancy
+        :return: Subscribed start points to query again
+        """
+        starts = list(self.answers)
+        start_cells = np.array(starts, dtype=np.int64)
+        reach = np.array([answer[0][2] if answer else self.finder.rows + self.finder.cols
+                          for answer in self.answers.values()], dtype=np.int64)
+        changed_cells = np.array(changed, dtype=np.int64)
+
+        affected = np.zeros(len(starts), dtype=bool)
+        chunk = max(1, PAIR_CHUNK // len(changed_cells))
+        for begin in range(0, len(starts), chunk):
+            block = start_cells[begin:begin + chunk]
+            distances = np.abs(block[:, None, :] - changed_cells[None, :, :]).sum(axis=2)
+            affected[begin:begin + chunk] = (distances <= reach[begin:begin + chunk, None]).any(axis=1)
+        return [starts[i] for i in np.flatnonzero(affected)]
+
+    def _notify(self, starts: List[Tuple[int, int]]):
+        """
+        Query the given start points again and call the subscribers of those whose answer changed.
+
+        :param starts: Subscribed start points to query
+        """
+        for start, closest_spots in zip(starts, self.finder.find_closest_parking_spots_batch(starts)):
+            if closest_spots == self.answers[start]:
+                continue
+            self.answers[start] = closest_spots
+            for callback in list(self.subscribers[start]):
+                try:
+                    callback(start, list(closest_spots))
+                except Exception as error:
+                    # A failing subscriber must not stop the others or the pipeline
+                    self.callback_errors += 1
+                    self.last_error = error
+                    continue
+                self.notifications_sent += 1
+
+
+def parse_event(line: str) -> Optional[Event]:
+    """
+    Parse one "row,col,occupied" line of an event stream.
+
+    :param line: Line of text; blank lines and lines starting with # are ignored
+    :return: Tuple (row, col, occupied), or None for an ignored line
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    try:
+        row, col, occupied = (int(field) for field in line.split(","))
+    except ValueError:
+        raise ValueError(f"Invalid occupancy event: {line!r}")
+    if occupied not in (0, 1):
+        raise ValueError(f"Invalid occupancy event: {line!r}")
+    return row, col, bool(occupied)
+
+
+def _parse_line(line: str, on_invalid: Optional[InvalidLineHandler]) -> Optional[Event]:
+    """
+    Parse one event line, skipping it if malformed.
+
+    :param line: Line of text
+    :param on_invalid: Optional handler told about a malformed line
+    :return: Tuple (row, col, occupied), or None for an ignored or malformed line
+    """
+    try:
+        return parse_event(line)
+    except ValueError as error:
+        if on_invalid is not None:
+            on_invalid(line, error)
+        return None
+
+
+async def stream_events(reader: asyncio.StreamReader,
+                        on_invalid: Optional[InvalidLineHandler] = None) -> AsyncIterator[Event]:
+    """
+    Read events from a stream, such as a socket connection, until it ends.
+
+    Malformed lines are skipped, so one bad reading does not drop the connection.
+
+    :param reader: asyncio stream reader delivering "row,col,occupied" lines
+    :param on_invalid: Optional handler told about each malformed line, such
+    as OccupancyFeed.reject_line
+    :return: Async iterator of (row, col, occupied) events
+    """
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        event = _parse_line(line.decode(errors="replace"), on_invalid)
+        if event is not None:
+            yield event
+
+
+async def file_events(path: str, follow: bool = False, poll_interval: float = 0.1,
+                      on_invalid: Optional[InvalidLineHandler] = None) -> AsyncIterator[Event]:
+    """
+    Read events from a text file, a local stand-in for a sensor stream.
+
+    Malformed lines are skipped and the rest of the file is still read.
+
+    :param path: Path of a file with one "row,col,occupied" line per event
+    :param follow: Keep waiting for lines appended to the file, like tail -f
+    :param poll_interval: Seconds between checks for new lines when following
+    :param on_invalid: Optional handler told about each malformed line, such
+    as OccupancyFeed.reject_line
+    :return: Async iterator of (row, col, occupied) events
+    """
+    with open(path, errors="replace") as event_file:
+        pending = ""
+        while True:
+            line = event_file.readline()
+            if not line.endswith("\n"):
+                # Keep a partially written last line until it is complete
+                pending += line
+                if not follow:
+                    if pending:
+                        event = _parse_line(pending, on_invalid)
+                        if event is not None:
+                            yield event
+                    return
+                await asyncio.sleep(poll_interval)
+                continue
+            event = _parse_line(pending + line, on_invalid)
+            pending = ""
+            if event is not None:
+                yield event
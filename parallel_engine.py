@@ -0,0 +1,164 @@
+import mmap
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from bfs_parking import ParkingSpotFinder
+
+Grid = Union[List[List[int]], np.ndarray]
+Start = Tuple[int, int]
+
+
+class ParallelParkingEngine:
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        """
+        Answer closest-spot queries over many parking grids in worker processes.
+
+        Grids reach the workers without pickling their cells. File-backed
+        np.memmap grids (for example from np.load(..., mmap_mode='r')) are
+        reopened from their file. Any other grid is copied once into a
+        shared-memory block that the workers map.
+
+        :param workers: Number of worker processes, defaults to the CPU count
+        :param max_pending: Maximum number of grids in flight at once,
+        defaults to twice the number of workers
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def __enter__(self) -> "ParallelParkingEngine":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Shut down the worker processes.
+        """
+        self._executor.shutdown()
+
+    def map_closest_spots(self, jobs: Iterable[Tuple[Grid, Sequence[Start]]]
+                          ) -> Iterator[Tuple[int, List[List[Tuple[int, int, int]]]]]:
+        """
+        Find the closest empty spots for every start of every grid.
+
+        Results are yielded as soon as each grid is done, so they do not come
+        back in submission order.
+
+        :param jobs: Iterable of (grid, starts) pairs
+        :return: Iterator of (job index, one list of (row, col, distance) per start);
+        each list is sorted by (row, col) as in find_closest_parking_spots_batch
+        """
+        pending = {}
+        jobs = enumerate(jobs)
+        try:
+            while True:
+                # Keep the pool busy without sharing every grid up front
+                for job_index, (grid, starts) in jobs:
+                    source, block = _share_grid(grid)
+                    future = self._executor.submit(_closest_spots_job, source,
+                                                   [tuple(start) for start in starts])
+                    pending[future] = (job_index, block)
+                    if len(pending) >= self.max_pending:
+                        break
+
+                if not pending:
+                    return
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_index, block = pending.pop(future)
+                    _release_grid(block)
+                    yield job_index, future.result()
+        finally:
+            for future, (_, block) in pending.items():
+                future.cancel()
+                _release_grid(block)
+
+
+def _share_grid(grid: Grid) -> Tuple[tuple, Optional[shared_memory.SharedMemory]]:
+    """
+    Describe a grid so a worker process can map it without pickling its cells.
+
+    :param grid: 2D list or NumPy array representing the parking area
+    :return: Tuple (source description for the worker, shared-memory block to release or None)
+    """
+    # Only whole-file maps; slices of a memmap keep their parent's offset
+    if (isinstance(grid, np.memmap) and isinstance(grid.base, mmap.mmap)
+            and grid.filename is not None and grid.dtype == np.uint8 and grid.flags.c_contiguous):
+        return ("memmap", grid.filename, grid.offset, grid.shape), None
+
+    cells = np.asarray(grid)
+    if cells.ndim != 2 or cells.size == 0:
+        raise ValueError("Invalid parking grid: Expected a non-empty 2D grid")
+    # Validate before the uint8 copy, which would wrap values such as 256 to 0
+    if not ((cells == 0) | (cells == 1)).all():
+        raise ValueError("Invalid parking grid: Values should be 0 or 1")
+
+    block = shared_memory.SharedMemory(create=True, size=cells.size)
+    np.ndarray(cells.shape, dtype=np.uint8, buffer=block.buf)[...] = cells
+    return ("shm", block.name, 0, cells.shape), block
+
+
+def _release_grid(block: Optional[shared_memory.SharedMemory]):
+    """
+    Free the shared-memory block of a finished grid.
+
+    :param block: Block returned by _share_grid, or None
+    """
+    if block is not None:
+        block.close()
+        block.unlink()
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    """
+    Map an existing shared-memory block without registering it with the resource tracker.
+
+    Only the parent, which creates and unlinks the block, should track it.
+    A worker's registration makes a tracker that outlives the parent's unlink
+    report the block as leaked and unlink it again. Unregistering after
+    attaching is no fix: a worker sharing the parent's tracker would drop the
+    parent's own registration.
+
+    :param name: Name of the block
+    :return: The attached block
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _closest_spots_job(source: tuple, starts: List[Start]) -> List[List[Tuple[int, int, int]]]:
+    """
+    Worker entry point: map a shared grid and answer all its queries.
+
+    :param source: Source description from _share_grid
+    :param starts: List of starting coordinates (row, col)
+    :return: One list of (row, col, distance) per start
+    """
+    kind, name, offset, shape = source
+    if kind == "memmap":
+        cells = np.memmap(name, dtype=np.uint8, mode="r", offset=offset, shape=shape)
+        return ParkingSpotFinder(cells).find_closest_parking_spots_batch(starts)
+
+    block = _attach_block(name)
+    try:
+        cells = np.ndarray(shape, dtype=np.uint8, buffer=block.buf)
+        finder = ParkingSpotFinder(cells)
+        del cells
+        return finder.find_closest_parking_spots_batch(starts)
+    finally:
+        block.close()
@@ -1,16 +1,88 @@
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QLineEdit, QLabel, QMessageBox, QSpinBox, QDialog, QFileDialog, QGraphicsView, QGraphicsScene, QGraphicsRectItem
+    QLineEdit, QLabel, QMessageBox, QSpinBox, QDialog, QFileDialog, QGraphicsView, QGraphicsScene, QGraphicsRectItem,
+    QGraphicsPixmapItem, QTabWidget
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QBrush, QColor
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor, QImage, QPixmap
 from PyQt5.QtGui import QPainter
-import pandas as pd
-import random
-from bfs_parking import ParkingSpotFinder
-from visualizations import visualize_parking_grid, visualize_route_on_parking_grid
+import numpy as np
+import threading
+from bfs_parking import ParkingSpotFinder, SearchCancelled
+from grid_io import open_grid
+from scenarios import random_grid
 import sys
 
+# Cell colors by state
+CELL_COLORS = {"empty": "green", "occupied": "red", "start": "yellow"}
+
+# Grids with more cells than this are drawn as images instead of one item per cell
+ITEM_CELL_LIMIT = 100 * 100
+
+# Cells per side of one image tile in image mode
+TILE_CELLS = 256
+
+
+class SearchSignals(QObject):
+    """
+    Signals of a background search, each tagged with the id of its query.
+    """
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class SearchWorker(QRunnable):
+    def __init__(self, query_id, finder, start):
+        """
+        Search for the closest parking spots and the route to the first one off the UI thread.
+        
+        The search runs on the window's finder. Edits cancel it and wait for it
+        to stop before they change the finder, so they cannot race it.
+        
+        :param query_id: Id reported with every signal, used to drop stale results
+        :param finder: ParkingSpotFinder over the current grid
+        :param start: Starting coordinates (row, col)
+        """
+        super().__init__()
+        self.query_id = query_id
+        self.finder = finder
+        self.start = start
+        self.signals = SearchSignals()
+        self.cancelled = threading.Event()
+        self.stopped = threading.Event()
+    
+    def cancel(self):
+        """
+        Ask the search to stop after its current BFS level.
+        """
+        self.cancelled.set()
+    
+    def run(self):
+        try:
+            search = self.finder.find_closest_parking_spots_with_routes(self.start, self.report_progress)
+            closest_spots = search.closest_spots
+            route = search.route_to(closest_spots[0][:2]) if closest_spots else []
+            self.signals.finished.emit(self.query_id, (closest_spots, route))
+        except SearchCancelled:
+            pass
+        except Exception as e:
+            self.signals.failed.emit(self.query_id, str(e))
+        finally:
+            self.stopped.set()
+    
+    def report_progress(self, expanded):
+        """
+        Progress callback of the search.
+        
+        :param expanded: Number of cells expanded so far
+        :return: False once the search has been cancelled
+        """
+        if self.cancelled.is_set():
+            return False
+        self.signals.progress.emit(self.query_id, expanded)
+        return True
+
 
 class ParkingGridFinder(QMainWindow):
     def __init__(self):
@@ -23,9 +95,16 @@ class ParkingGridFinder(QMainWindow):
         self.cols = 10
         self.cell_size = 40  # Size of each grid cell in pixels
         
+        # Brushes shared by every cell item, one per state
+        self.brushes = {state: QBrush(QColor(color)) for state, color in CELL_COLORS.items()}
+        
+        # Background search state; results of any query but the latest are dropped
+        self.thread_pool = QThreadPool.globalInstance()
+        self.search_worker = None
+        self.query_id = 0
+        
         # Initialize grid with all empty spots
-        self.grid = [[0 for _ in range(self.cols)] for _ in range(self.rows)]
-        self.start_point = None
+        self.set_grid(np.zeros((self.rows, self.cols), dtype=np.uint8))
         
         # Central widget and main layout
         central_widget = QWidget()
@@ -44,6 +123,7 @@ class ParkingGridFinder(QMainWindow):
             ("Randomize Grid", self.randomize_grid),
             ("Set Start Point", self.set_start_point),
             ("Find Closest Spots", self.find_closest_spots),
+            ("Cancel Search", self.cancel_search),
             ("Zoom In", lambda: self.zoom(1.2)),
             ("Zoom Out", lambda: self.zoom(0.8))
         ]
@@ -62,11 +142,22 @@ class ParkingGridFinder(QMainWindow):
         occupancy_layout.addWidget(occupancy_label)
         occupancy_layout.addWidget(self.occupancy_input)
         
+        # Search status and progress
+        self.status_label = QLabel("Ready")
+        main_layout.addWidget(self.status_label)
+        
         # Graphics view for grid
         self.scene = QGraphicsScene()
         self.view = QGraphicsView(self.scene)
         self.view.setRenderHint(QPainter.Antialiasing)
-        main_layout.addWidget(self.view)
+        
+        # Grid editor and search results share the window as tabs; the result
+        # canvases, and matplotlib with them, are created with the first result
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self.view, "Grid")
+        self.spots_canvas = None
+        self.route_canvas = None
+        main_layout.addWidget(self.tabs)
         
         # Create initial grid
         self.create_grid()
@@ -74,36 +165,96 @@ class ParkingGridFinder(QMainWindow):
     def create_grid(self):
         """
         Create the grid representation in the scene.
+        
+        Small grids get one rectangle item per cell. Larger grids are drawn
+        as image tiles with one pixel per cell, scaled up to the cell size.
         """
         self.scene.clear()
         self.grid_items = []
+        self.grid_tiles = []
         
-        for row in range(self.rows):
-            row_items = []
-            for col in range(self.cols):
-                rect = QGraphicsRectItem(
-                    col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
-                rect.setPen(Qt.black)
-                self.scene.addItem(rect)
-                row_items.append(rect)
-            self.grid_items.append(row_items)
+        if self.rows * self.cols <= ITEM_CELL_LIMIT:
+            for row in range(self.rows):
+                row_items = []
+                for col in range(self.cols):
+                    rect = QGraphicsRectItem(
+                        col * self.cell_size, row * self.cell_size, self.cell_size, self.cell_size)
+                    rect.setPen(Qt.black)
+                    self.scene.addItem(rect)
+                    row_items.append(rect)
+                self.grid_items.append(row_items)
+        else:
+            for top in range(0, self.rows, TILE_CELLS):
+                row_tiles = []
+                for left in range(0, self.cols, TILE_CELLS):
+                    tile = QGraphicsPixmapItem()
+                    tile.setPos(left * self.cell_size, top * self.cell_size)
+                    tile.setScale(self.cell_size)
+                    tile.setTransformationMode(Qt.FastTransformation)
+                    self.scene.addItem(tile)
+                    row_tiles.append([tile, None])
+                self.grid_tiles.append(row_tiles)
         
         self.update_grid_colors()
         self.view.setSceneRect(0, 0, self.cols * self.cell_size, self.rows * self.cell_size)
     
     def update_grid_colors(self):
         """
-        Update the colors of the grid cells based on their state.
+        Update the colors of all grid cells based on their state.
         """
+        if self.grid_tiles:
+            # Map every cell to its ARGB color in one lookup
+            palette = np.array([QColor(CELL_COLORS[state]).rgb() for state in ("empty", "occupied", "start")],
+                               dtype=np.uint32)
+            codes = self.grid.copy()
+            if self.start_point:
+                codes[self.start_point] = 2
+            pixels = palette[codes]
+            
+            for tile_row, row_tiles in enumerate(self.grid_tiles):
+                for tile_col, tile in enumerate(row_tiles):
+                    top, left = tile_row * TILE_CELLS, tile_col * TILE_CELLS
+                    block = np.ascontiguousarray(pixels[top:top + TILE_CELLS, left:left + TILE_CELLS])
+                    height, width = block.shape
+                    tile[1] = QImage(block.data, width, height, 4 * width, QImage.Format_RGB32).copy()
+                    tile[0].setPixmap(QPixmap.fromImage(tile[1]))
+            return
+        
         for row in range(self.rows):
             for col in range(self.cols):
-                cell = self.grid_items[row][col]
-                if self.start_point and (row, col) == self.start_point:
-                    cell.setBrush(QBrush(QColor("yellow")))
-                elif self.grid[row][col] == 1:
-                    cell.setBrush(QBrush(QColor("red")))
-                else:
-                    cell.setBrush(QBrush(QColor("green")))
+                self.grid_items[row][col].setBrush(self.brushes[self.cell_state(row, col)])
+    
+    def repaint_cells(self, cells):
+        """
+        Update the colors of only the given grid cells.
+        
+        :param cells: Iterable of (row, col) coordinates whose state changed
+        """
+        if not self.grid_tiles:
+            for row, col in cells:
+                self.grid_items[row][col].setBrush(self.brushes[self.cell_state(row, col)])
+            return
+        
+        dirty_tiles = {}
+        for row, col in cells:
+            tile = self.grid_tiles[row // TILE_CELLS][col // TILE_CELLS]
+            color = QColor(CELL_COLORS[self.cell_state(row, col)]).rgb()
+            tile[1].setPixel(col % TILE_CELLS, row % TILE_CELLS, color)
+            dirty_tiles[id(tile)] = tile
+        for tile in dirty_tiles.values():
+            tile[0].setPixmap(QPixmap.fromImage(tile[1]))
+    
+    def cell_state(self, row, col):
+        """
+        Get the display state of a grid cell.
+        
+        :return: "start", "occupied" or "empty"
+        """
+        if self.start_point and (row, col) == self.start_point:
+            return "start"
+        if self.grid[row, col] == 1:
+            return "occupied"
+        return "empty"
     
     def toggle_spot(self, row, col):
         """
@@ -112,8 +263,24 @@ class ParkingGridFinder(QMainWindow):
         if self.start_point and (row, col) == self.start_point:
             QMessageBox.information(self, "Info", "Cannot modify start point")
             return
-        self.grid[row][col] = 1 - self.grid[row][col]
-        self.update_grid_colors()
+        self.cancel_search(wait=True)
+        self.finder.set_occupied(row, col, not self.grid[row, col])
+        self.repaint_cells([(row, col)])
+    
+    def set_grid(self, grid):
+        """
+        Replace the whole parking grid.
+        
+        The finder built here is kept until the next replacement; toggle_spot
+        updates it through set_occupied, and self.grid is its read-only view.
+        
+        :param grid: 2D array of 0 (empty) and 1 (occupied)
+        """
+        self.cancel_search()
+        self.finder = ParkingSpotFinder(grid)
+        self.grid = self.finder.grid
+        self.rows, self.cols = self.grid.shape
+        self.start_point = None
     
     def zoom(self, factor):
         """
@@ -156,10 +323,7 @@ class ParkingGridFinder(QMainWindow):
         layout.addLayout(btn_layout)
         
         def accept():
-            self.rows = rows_spin.value()
-            self.cols = cols_spin.value()
-            self.grid = [[0 for _ in range(self.cols)] for _ in range(self.rows)]
-            self.start_point = None
+            self.set_grid(np.zeros((rows_spin.value(), cols_spin.value()), dtype=np.uint8))
             self.create_grid()
             dialog.accept()
         
@@ -169,27 +333,18 @@ class ParkingGridFinder(QMainWindow):
     
     def load_csv_grid(self):
         """
-        Load parking grid from a CSV file.
+        Load parking grid from a CSV, .npy or bit-packed .pgrid file.
         """
         try:
-            file_path, _ = QFileDialog.getOpenFileName(self, "Select CSV Grid File", "", "CSV Files (*.csv)")
+            file_path, _ = QFileDialog.getOpenFileName(
+                self, "Select Grid File", "", "Grid Files (*.csv *.npy *.pgrid);;CSV Files (*.csv)")
             if not file_path:
                 return
             
-            df = pd.read_csv(file_path, header=None)
-            grid_data = df.values.tolist()
-            
-            for row in grid_data:
-                for val in row:
-                    if val not in (0, 1):
-                        raise ValueError("CSV must contain only 0 and 1")
-            
-            self.grid = grid_data
-            self.rows = len(grid_data)
-            self.cols = len(grid_data[0])
-            self.start_point = None
+            # Parsed and validated in vectorized chunks by grid_io
+            self.set_grid(open_grid(file_path))
             self.create_grid()
-            QMessageBox.information(self, "Success", "CSV grid loaded successfully")
+            QMessageBox.information(self, "Success", "Grid loaded successfully")
         
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
@@ -203,15 +358,7 @@ class ParkingGridFinder(QMainWindow):
             if not (0 <= occupancy_rate <= 100):
                 raise ValueError("Occupancy rate must be between 0 and 100")
             
-            num_occupied = int(self.rows * self.cols * occupancy_rate / 100)
-            all_coords = [(r, c) for r in range(self.rows) for c in range(self.cols)]
-            occupied_coords = random.sample(all_coords, num_occupied)
-            
-            self.grid = [[0 for _ in range(self.cols)] for _ in range(self.rows)]
-            for r, c in occupied_coords:
-                self.grid[r][c] = 1
-            
-            self.start_point = None
+            self.set_grid(random_grid(self.rows, self.cols, occupancy_rate / 100, np.random.default_rng()))
             self.update_grid_colors()
             QMessageBox.information(self, "Success", f"Grid randomized with {occupancy_rate}% occupancy")
         
@@ -243,42 +390,114 @@ class ParkingGridFinder(QMainWindow):
             row = rows_spin.value()
             col = cols_spin.value()
             
+            previous = self.start_point
             self.start_point = (row, col)
-            self.update_grid_colors()
+            self.cancel_search()
+            self.repaint_cells([previous, self.start_point] if previous else [self.start_point])
             dialog.accept()
         
         btn.clicked.connect(accept)
         dialog.exec_()
     
     def find_closest_spots(self):
-        """Find and display the closest parking spots."""
+        """Start a background search for the closest parking spots."""
         if not self.start_point:
             QMessageBox.warning(self, "Error", "Please set a start point first.")
             return
         
-        # Create the finder object
-        finder = ParkingSpotFinder(self.grid)
+        # Only the latest query is of interest
+        self.cancel_search()
+        self.query_id += 1
         
-        # Find closest spots
-        closest_spots = finder.find_closest_parking_spots(self.start_point)
+        worker = SearchWorker(self.query_id, self.finder, self.start_point)
+        worker.signals.progress.connect(self.on_search_progress)
+        worker.signals.finished.connect(self.on_search_finished)
+        worker.signals.failed.connect(self.on_search_failed)
+        self.search_worker = worker
+        self.status_label.setText("Searching...")
+        self.thread_pool.start(worker)
+    
+    def cancel_search(self, wait=False):
+        """
+        Cancel the running search, if any, and drop its results.
+        
+        :param wait: Also wait for the search to stop, as before changing the finder it runs on
+        """
+        if self.search_worker is None:
+            return
+        worker = self.search_worker
+        worker.cancel()
+        if wait and not self.thread_pool.tryTake(worker):
+            worker.stopped.wait()
+        self.search_worker = None
+        self.query_id += 1
+        self.status_label.setText("Search cancelled")
+    
+    def on_search_progress(self, query_id, expanded):
+        """
+        Show how many cells the running search has expanded.
+        """
+        if query_id == self.query_id:
+            self.status_label.setText(f"Searching... {expanded} of {self.rows * self.cols} cells expanded")
+    
+    def on_search_failed(self, query_id, message):
+        """
+        Report a search that raised an error.
+        """
+        if query_id != self.query_id:
+            return
+        self.search_worker = None
+        self.status_label.setText("Search failed")
+        QMessageBox.critical(self, "Error", message)
+    
+    def on_search_finished(self, query_id, result):
+        """Display the closest parking spots and the route to the first one."""
+        # Results of a query made before the grid was edited are stale
+        if query_id != self.query_id:
+            return
+        self.search_worker = None
+        closest_spots, route = result
         
         # If no closest spots found, display a message and return
         if not closest_spots:
-            QMessageBox.information(self, "No Spots Found", "No empty parking spots found.")
+            self.status_label.setText("No empty parking spots found.")
             return
         
         # Create a formatted string to display the closest spots and their distances
-        closest_spots_info = "\n".join([f"Spot: ({spot[0]},{spot[1]}), Distance: {spot[2]}" for spot in closest_spots])
+        closest_spots_info = ", ".join([f"({spot[0]},{spot[1]})" for spot in closest_spots])
+        self.status_label.setText(f"Closest parking spots at distance {closest_spots[0][2]}: {closest_spots_info}")
+        
+        from visualizations import draw_parking_grid, draw_route_on_parking_grid
+        if self.spots_canvas is None:
+            self.create_result_tabs()
         
-        # Show closest spots and their distances in a message box
-        QMessageBox.information(self, "Closest Parking Spots", f"The closest parking spots are:\n\n{closest_spots_info}")
+        # Draw the parking grid with the closest spots highlighted
+        figure = self.spots_canvas.figure
+        figure.clear()
+        draw_parking_grid(figure.add_subplot(), self.grid, self.start_point, closest_spots)
+        figure.tight_layout()
+        self.spots_canvas.draw_idle()
         
-        # Visualize the parking grid with the closest spots highlighted
-        visualize_parking_grid(self.grid, self.start_point, closest_spots)
+        # Draw the route to the first closest spot
+        figure = self.route_canvas.figure
+        figure.clear()
+        draw_route_on_parking_grid(figure.add_subplot(), self.grid, self.start_point, route)
+        figure.tight_layout()
+        self.route_canvas.draw_idle()
+        
+        self.tabs.setCurrentWidget(self.spots_canvas)
+    
+    def create_result_tabs(self):
+        """
+        Create the tabs showing search results as embedded matplotlib canvases.
+        """
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+        from matplotlib.figure import Figure
         
-        # Optionally, find the route to the first closest spot and visualize it
-        route = finder.find_route_to_parking_spot(self.start_point, closest_spots[0][:2])
-        visualize_route_on_parking_grid(self.grid, self.start_point, route)
+        self.spots_canvas = FigureCanvasQTAgg(Figure(figsize=(10, 8)))
+        self.route_canvas = FigureCanvasQTAgg(Figure(figsize=(10, 8)))
+        self.tabs.addTab(self.spots_canvas, "Closest Spots")
+        self.tabs.addTab(self.route_canvas, "Route")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,200 @@
+"""
+Run parking queries on a grid file from the command line, without the GUI.
+
+Queries come from --start/--target or, one per line, from a file or stdin
+given with --queries. A query line is either JSON, such as
+{"start": [5, 5], "target": [0, 0], "method": "astar"}, or plain numbers
+"row col" or "row col target_row target_col". Every answer is written as
+one JSON line.
+
+Usage:
+    python -m bfs_parking grid.csv --start 5 5
+    python -m bfs_parking grid.npy --queries queries.txt --output answers.jsonl
+    cat queries.txt | python -m bfs_parking grid.npy --queries -
+    python -m bfs_parking grid.npy --start 5 5 --target 0 0 --stats
+    python -m bfs_parking grid.npy --start 5 5 --profile --profile-sort tottime
+    python -m bfs_parking grid.npy --queries queries.txt --cache results.sqlite
+"""
+import argparse
+import json
+import sys
+from typing import Iterable, Iterator, Optional, TextIO
+
+from bfs_parking import ParkingSpotFinder
+from grid_io import open_grid
+
+# Route methods accepted in queries
+METHODS = ("bfs", "astar")
+
+
+def parse_query(line: str) -> Optional[dict]:
+    """
+    Parse one query line.
+
+    :param line: JSON object or whitespace/comma separated numbers; blank lines
+    and lines starting with # are ignored
+    :return: Dict with "start" and optionally "target" and "method", or None
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+
+    if line.startswith("{"):
+        query = json.loads(line)
+    else:
+        try:
+            numbers = [int(field) for field in line.replace(",", " ").split()]
+        except ValueError:
+            raise ValueError(f"Invalid query: {line!r}")
+        if len(numbers) not in (2, 4):
+            raise ValueError(f"Invalid query: {line!r}")
+        query = {"start": numbers[:2]}
+        if len(numbers) == 4:
+            query["target"] = numbers[2:]
+
+    if not isinstance(query, dict) or query.get("start") is None:
+        raise ValueError(f"Query has no start: {line!r}")
+    for field in ("start", "target"):
+        if query.get(field) is not None and not _is_cell(query[field]):
+            raise ValueError(f"Query {field} must be two integers: {line!r}")
+    if query.get("method", "bfs") not in METHODS:
+        raise ValueError(f"Unknown route method: {query['method']}")
+    return query
+
+
+def _is_cell(value) -> bool:
+    return (isinstance(value, (list, tuple)) and len(value) == 2
+            and all(isinstance(number, int) and not isinstance(number, bool) for number in value))
+
+
+def answer(finder: ParkingSpotFinder, query: dict) -> dict:
+    """
+    Answer one query: the closest spots, and the route when it has a target.
+
+    :param finder: ParkingSpotFinder over the grid
+    :param query: Dict with "start" and optionally "target" and "method"
+    :return: Dict with the query fields, "closest_spots" and possibly "route"
+    """
+    start = tuple(query["start"])
+    result = dict(query, closest_spots=finder.find_closest_parking_spots(start))
+    if query.get("target") is not None:
+        target = tuple(query["target"])
+        if query.get("method") == "astar":
+            result["route"] = finder.find_route_astar(start, target)[0]
+        else:
+            result["route"] = finder.find_route_to_parking_spot(start, target)
+    return result
+
+
+def run_queries(finder: ParkingSpotFinder, lines: Iterable[str], output: TextIO) -> int:
+    """
+    Answer query lines and write one JSON line per query.
+
+    A query that fails is reported as {"line": n, "error": message} and the
+    remaining queries still run.
+
+    :param finder: ParkingSpotFinder over the grid
+    :param lines: Query lines
+    :param output: Text stream receiving the JSON lines
+    :return: Number of failed queries
+    """
+    failed = 0
+    for number, line in enumerate(lines, 1):
+        try:
+            query = parse_query(line)
+            if query is None:
+                continue
+            result = answer(finder, query)
+        except ValueError as error:
+            result = {"line": number, "error": str(error)}
+            failed += 1
+        output.write(json.dumps(result) + "\n")
+    return failed
+
+
+def query_lines(args) -> Iterator[str]:
+    """
+    Get the query lines selected by the command line arguments.
+
+    :param args: Parsed arguments
+    :return: Iterator of query lines
+    """
+    if args.start is not None:
+        query = {"start": args.start}
+        if args.target is not None:
+            query["target"] = args.target
+        if args.astar:
+            query["method"] = "astar"
+        for _ in range(args.repeat):
+            yield json.dumps(query)
+    if args.queries == "-":
+        yield from sys.stdin
+    elif args.queries:
+        with open(args.queries) as query_file:
+            yield from query_file
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bfs_parking", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("grid", help="Grid file: .csv, .npy or .pgrid")
+    parser.add_argument("--start", type=int, nargs=2, metavar=("ROW", "COL"))
+    parser.add_argument("--target", type=int, nargs=2, metavar=("ROW", "COL"),
+                        help="Also find a route from the start to this cell")
+    parser.add_argument("--astar", action="store_true", help="Route with A* instead of BFS")
+    parser.add_argument("--queries", metavar="FILE", help="File with one query per line, - for stdin")
+    parser.add_argument("--output", help="Write the JSON lines to this file instead of stdout")
+    parser.add_argument("--packed", action="store_true", help="Store the grid at one bit per cell")
+    parser.add_argument("--seed", type=int, help="Seed for the exploration order")
+    parser.add_argument("--repeat", type=int, default=1, help="Run the --start query this many times")
+    parser.add_argument("--stats", action="store_true",
+                        help="Print the search statistics of every query to stderr as JSON lines")
+    parser.add_argument("--cache", metavar="FILE",
+                        help="Reuse results of earlier runs on the same grid content from this sqlite file")
+    parser.add_argument("--cache-size", type=int, default=100000, help="Maximum number of results in the cache file")
+    parser.add_argument("--profile", action="store_true", help="Print a cProfile report of the queries to stderr")
+    parser.add_argument("--profile-output", help="Also save the raw profile for pstats or snakeviz")
+    parser.add_argument("--profile-sort", default="cumulative", help="pstats sort key of the report")
+    parser.add_argument("--profile-limit", type=int, default=25, help="Number of functions in the report")
+    args = parser.parse_args(argv)
+    if args.start is None and args.queries is None:
+        parser.error("either --start or --queries is required")
+
+    def print_stats(stats):
+        print(json.dumps(stats.as_dict()), file=sys.stderr)
+
+    cache = None
+    if args.cache:
+        from result_cache import ResultCache
+        cache = ResultCache(args.cache, disk_size=args.cache_size)
+
+    finder = ParkingSpotFinder(open_grid(args.grid), seed=args.seed, packed=args.packed,
+                               metrics=print_stats if args.stats else None, result_cache=cache)
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        if args.profile or args.profile_output:
+            import cProfile
+            import io
+            import pstats
+
+            profiler = cProfile.Profile()
+            failed = profiler.runcall(run_queries, finder, query_lines(args), output)
+            if args.profile_output:
+                profiler.dump_stats(args.profile_output)
+            if args.profile:
+                report = io.StringIO()
+                pstats.Stats(profiler, stream=report).sort_stats(args.profile_sort).print_stats(args.profile_limit)
+                print(report.getvalue(), file=sys.stderr)
+        else:
+            failed = run_queries(finder, query_lines(args), output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if cache is not None:
+            if args.stats:
+                print(json.dumps({"result_cache": cache.stats()}), file=sys.stderr)
+            cache.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
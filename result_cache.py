@@ -0,0 +1,254 @@
+import json
+import sqlite3
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Optional
+
+from bfs_parking import ParkingSpotFinder
+
+# Cells hashed per vectorized chunk when a fingerprint is first computed
+CHUNK_CELLS = 1 << 20
+
+_MASK = (1 << 64) - 1
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """
+    SplitMix64 finalizer over an array of uint64 values (wrapping arithmetic).
+    """
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def _cell_key(index: int) -> int:
+    """
+    128-bit key of an occupied cell, the scalar counterpart of _mix.
+
+    :param index: Row-major cell index, row * cols + col
+    :return: Key with the mix of 2 * index in the high half and of 2 * index + 1 in the low half
+    """
+    key = 0
+    for value in (2 * index, 2 * index + 1):
+        value = (value + 0x9E3779B97F4A7C15) & _MASK
+        value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+        value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+        key = (key << 64) | (value ^ (value >> 31))
+    return key
+
+
+def grid_fingerprint(grid: np.ndarray) -> int:
+    """
+    Hash the occupancy of a grid by XOR-ing the keys of its occupied cells.
+
+    Flipping one cell flips its key in and out of the hash, so a fingerprint
+    can be kept up to date in O(1) per change, and a grid that returns to an
+    earlier occupancy gets its earlier fingerprint back.
+
+    :param grid: 2D array of 0 (empty) and 1 (occupied)
+    :return: 128-bit fingerprint
+    """
+    flat = np.asarray(grid).reshape(-1)
+    high = low = np.uint64(0)
+    for begin in range(0, len(flat), CHUNK_CELLS):
+        occupied = np.flatnonzero(flat[begin:begin + CHUNK_CELLS]).astype(np.uint64) + np.uint64(begin)
+        high ^= np.bitwise_xor.reduce(_mix(2 * occupied), initial=np.uint64(0))
+        low ^= np.bitwise_xor.reduce(_mix(2 * occupied + np.uint64(1)), initial=np.uint64(0))
+    return (int(high) << 64) | int(low)
+
+
+class GridFingerprint:
+    def __init__(self, finder: ParkingSpotFinder):
+        """
+        Fingerprint of a finder's grid, kept up to date through occupancy changes.
+
+        :param finder: ParkingSpotFinder whose grid is hashed
+        """
+        self.finder = finder
+        self.value = grid_fingerprint(finder.grid)
+        finder.add_listener(self._on_occupancy_change)
+
+    @property
+    def digest(self) -> str:
+        """
+        The fingerprint with the grid shape, as used in cache keys.
+        """
+        return f"{self.finder.rows}x{self.finder.cols}:{self.value:032x}"
+
+    def detach(self):
+        """
+        Stop following occupancy changes of the finder.
+        """
+        self.finder.remove_listener(self._on_occupancy_change)
+
+    def _on_occupancy_change(self, row: int, col: int, occupied: bool):
+        self.value ^= _cell_key(row * self.finder.cols + col)
+
+
+class ResultCache:
+    def __init__(self, path: Optional[str] = None, memory_size: int = 1024, disk_size: int = 100000):
+        """
+        Two-tier cache of query results keyed by grid content.
+
+        Results are looked up in an in-memory LRU first, then in an optional
+        sqlite file that keeps them across process restarts. Both tiers are
+        bounded; the disk tier evicts its least recently used tenth when full.
+        Its entry count is kept by triggers inside the file, so the bound
+        holds when several processes share it. Values must be
+        JSON-serializable; tuples come back as tuples.
+
+        :param path: sqlite file of the disk tier, None for memory only
+        :param memory_size: Maximum number of results held in memory
+        :param disk_size: Maximum number of results stored on disk
+        """
+        if memory_size < 0 or disk_size < 1:
+            raise ValueError("Cache sizes must be positive")
+
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            # `used` holds wall-clock nanoseconds, comparable between processes
+            self._db.executescript("""
+                BEGIN IMMEDIATE;
+                CREATE TABLE IF NOT EXISTS results
+                    (key TEXT PRIMARY KEY, value TEXT NOT NULL, used INTEGER NOT NULL);
+                CREATE INDEX IF NOT EXISTS results_used ON results (used);
+                CREATE TABLE IF NOT EXISTS entry_count
+                    (id INTEGER PRIMARY KEY CHECK (id = 0), entries INTEGER NOT NULL);
+                INSERT OR IGNORE INTO entry_count VALUES (0, (SELECT COUNT(*) FROM results));
+                CREATE TRIGGER IF NOT EXISTS results_inserted AFTER INSERT ON results
+                    BEGIN UPDATE entry_count SET entries = entries + 1; END;
+                CREATE TRIGGER IF NOT EXISTS results_deleted AFTER DELETE ON results
+                    BEGIN UPDATE entry_count SET entries = entries - 1; END;
+                COMMIT;
+            """)
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a result.
+
+        :param key: Cache key
+        :return: Stored result, or None on a miss
+        """
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE results SET used = ? WHERE key = ?", (time.time_ns(), key))
+                    self._db.commit()
+                    value = _from_json(json.loads(row[0]))
+                    self._remember(key, value)
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Any):
+        """
+        Store a result in both tiers.
+
+        :param key: Cache key
+        :param value: JSON-serializable result
+        """
+        with self._lock:
+            self._remember(key, value)
+            if self._db is None:
+                return
+
+            # An upsert rather than REPLACE, whose implicit delete skips the triggers;
+            # the count is read in the same write transaction as the insert
+            self._db.execute("INSERT INTO results (key, value, used) VALUES (?, ?, ?) "
+                             "ON CONFLICT (key) DO UPDATE SET value = excluded.value, used = excluded.used",
+                             (key, json.dumps(value), time.time_ns()))
+            entries = self._disk_entries()
+            if entries > self.disk_size:
+                evicted = entries - self.disk_size + self.disk_size // 10
+                self._db.execute("DELETE FROM results WHERE key IN "
+                                 "(SELECT key FROM results ORDER BY used LIMIT ?)", (evicted,))
+            self._db.commit()
+
+    def stats(self) -> dict:
+        """
+        Get the hit and miss counters and the tier sizes.
+
+        :return: Dict of counters
+        """
+        lookups = self.hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_entries": self._disk_entries() if self._db is not None else 0,
+        }
+
+    def clear(self):
+        """
+        Drop every stored result and reset the counters.
+        """
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def close(self):
+        """
+        Close the disk tier; the memory tier stays usable.
+        """
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _disk_entries(self) -> int:
+        return self._db.execute("SELECT entries FROM entry_count").fetchone()[0]
+
+    def _remember(self, key: str, value: Any):
+        if not self.memory_size:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+
+def _from_json(value: Any) -> Any:
+    """
+    Turn the lists of a decoded JSON result back into tuples, like the finder returns.
+    """
+    if isinstance(value, list):
+        return [tuple(item) if isinstance(item, list) else item for item in value]
+    return value
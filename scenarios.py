@@ -0,0 +1,147 @@
+import itertools
+import numpy as np
+from typing import Iterator, Optional, Tuple, Union
+
+# Occupancy as a fixed rate, or a (low, high) range drawn per scenario
+Occupancy = Union[float, Tuple[float, float]]
+
+
+def random_grid(rows: int, cols: int, occupancy: float, rng: np.random.Generator,
+                exact: bool = True) -> np.ndarray:
+    """
+    Build a grid with occupied spots scattered uniformly at random.
+
+    :param rows: Number of rows
+    :param cols: Number of columns
+    :param occupancy: Occupied fraction between 0 and 1
+    :param rng: NumPy random generator
+    :param exact: Occupy exactly int(rows * cols * occupancy) spots, like the GUI's
+    Randomize Grid; otherwise occupy each spot independently, which is faster
+    :return: 2D uint8 array, 0 for empty spots and 1 for occupied spots
+    """
+    _check_occupancy(occupancy)
+    if not exact:
+        return (rng.random((rows, cols), dtype=np.float32) < occupancy).view(np.uint8)
+
+    grid = np.zeros(rows * cols, dtype=np.uint8)
+    grid[rng.choice(rows * cols, int(rows * cols * occupancy), replace=False)] = 1
+    return grid.reshape(rows, cols)
+
+
+def clustered_grid(rows: int, cols: int, occupancy: float, rng: np.random.Generator,
+                   cluster_size: int = 16, noise: float = 0.3) -> np.ndarray:
+    """
+    Build a grid whose occupied spots form clusters, like busy and quiet areas of a lot.
+
+    A coarse random field with one value per cluster_size x cluster_size block
+    is mixed with per-spot noise, and the highest-scoring spots are occupied.
+
+    :param rows: Number of rows
+    :param cols: Number of columns
+    :param occupancy: Occupied fraction between 0 and 1
+    :param rng: NumPy random generator
+    :param cluster_size: Side of the blocks sharing a cluster value
+    :param noise: Weight of the per-spot noise, 0 for solid blocks
+    :return: 2D uint8 array with exactly int(rows * cols * occupancy) occupied spots
+    """
+    _check_occupancy(occupancy)
+    if cluster_size < 1:
+        raise ValueError("Cluster size must be positive")
+
+    coarse = rng.random((-(-rows // cluster_size), -(-cols // cluster_size)), dtype=np.float32)
+    score = np.repeat(np.repeat(coarse, cluster_size, axis=0), cluster_size, axis=1)[:rows, :cols]
+    if noise:
+        score = score + noise * rng.random((rows, cols), dtype=np.float32)
+    return _occupy_top(score.reshape(-1), int(rows * cols * occupancy)).reshape(rows, cols)
+
+
+def aisle_grid(rows: int, cols: int, occupancy: float, rng: np.random.Generator,
+               bay_depth: int = 2, cross_aisle_every: int = 0) -> np.ndarray:
+    """
+    Build a lot of parking bays separated by one-row driving aisles.
+
+    The grid has no separate cell type for aisles, so aisle cells are marked
+    occupied: vehicles drive through them but never park there. The
+    occupancy rate applies to the bay cells.
+
+    :param rows: Number of rows
+    :param cols: Number of columns
+    :param occupancy: Occupied fraction of the bay cells between 0 and 1
+    :param rng: NumPy random generator
+    :param bay_depth: Rows of spots between two aisles
+    :param cross_aisle_every: Also run a vertical aisle every this many columns, 0 for none
+    :return: 2D uint8 array
+    """
+    _check_occupancy(occupancy)
+    if bay_depth < 1:
+        raise ValueError("Bay depth must be positive")
+
+    aisles = np.zeros((rows, cols), dtype=bool)
+    aisles[bay_depth::bay_depth + 1, :] = True
+    if cross_aisle_every:
+        aisles[:, cross_aisle_every::cross_aisle_every + 1] = True
+
+    grid = aisles.astype(np.uint8)
+    bays = np.flatnonzero(~aisles)
+    flat = grid.reshape(-1)
+    flat[bays[rng.choice(len(bays), int(len(bays) * occupancy), replace=False)]] = 1
+    return grid
+
+
+# Grid builders by layout name
+LAYOUTS = {
+    "random": random_grid,
+    "clustered": clustered_grid,
+    "aisles": aisle_grid,
+}
+
+
+def generate_scenarios(rows: int, cols: int, count: Optional[int] = None, layout: str = "random",
+                       occupancy: Occupancy = 0.3, seed: Optional[int] = None, first: int = 0,
+                       **options) -> Iterator[np.ndarray]:
+    """
+    Stream seeded scenario grids, ready to pass to ParkingSpotFinder as they are.
+
+    Scenario i is generated from its own seed sequence derived from (seed, i),
+    so any scenario can be reproduced alone and a sweep can be split across
+    processes with `first` and `count`.
+
+    :param rows: Number of rows of every grid
+    :param cols: Number of columns of every grid
+    :param count: Number of scenarios, None for an endless stream
+    :param layout: "random", "clustered" or "aisles"
+    :param occupancy: Occupied fraction, or a (low, high) range drawn per scenario
+    :param seed: Seed of the whole sweep, None for a fresh one
+    :param first: Index of the first scenario
+    :param options: Extra arguments for the layout's grid builder
+    :return: Iterator of 2D uint8 arrays
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown scenario layout: {layout}")
+    build = LAYOUTS[layout]
+    entropy = np.random.SeedSequence(seed).entropy
+
+    indices = itertools.count(first) if count is None else range(first, first + count)
+    for index in indices:
+        rng = np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(index,)))
+        rate = rng.uniform(*occupancy) if isinstance(occupancy, tuple) else occupancy
+        yield build(rows, cols, rate, rng, **options)
+
+
+def _occupy_top(score: np.ndarray, occupied: int) -> np.ndarray:
+    """
+    Occupy the cells with the highest scores.
+
+    :param score: Flat array of scores
+    :param occupied: Number of cells to occupy
+    :return: Flat uint8 array with exactly `occupied` ones
+    """
+    grid = np.zeros(len(score), dtype=np.uint8)
+    if occupied:
+        grid[np.argpartition(score, len(score) - occupied)[len(score) - occupied:]] = 1
+    return grid
+
+
+def _check_occupancy(occupancy: float):
+    if not 0 <= occupancy <= 1:
+        raise ValueError("Occupancy rate must be between 0 and 1")
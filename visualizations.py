@@ -1,148 +1,197 @@
-import matplotlib.pyplot as plt
 import numpy as np
-from typing import List, Tuple
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from typing import List, Optional, Sequence, Tuple, Union
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
 from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
 
-def visualize_parking_grid(grid: List[List[int]], 
-                            start: Tuple[int, int], 
-                            closest_spots: List[Tuple[int, int, int]]):
+# Cell codes used to index the color palette
+EMPTY, OCCUPIED, START, HIGHLIGHT = 0, 1, 2, 3
+
+# Per-cell coordinate labels are drawn only up to this many cells
+LABEL_CELL_LIMIT = 400
+
+# Grid lines are drawn only while both sides have at most this many cells
+GRIDLINE_LIMIT = 100
+
+Grid = Union[List[List[int]], np.ndarray]
+
+
+def visualize_parking_grid(grid: Grid,
+                            start: Tuple[int, int],
+                            closest_spots: List[Tuple[int, int, int]],
+                            save_path: Optional[str] = None):
     """
     Visualize the parking grid with closest parking spots.
-    
-    :param grid: 2D list representing the parking area (0 for empty, 1 for occupied)
+
+    :param grid: 2D list or array representing the parking area (0 for empty, 1 for occupied)
+    :param start: Starting coordinates (row, col)
+    :param closest_spots: List of closest parking spots with their distances
+    :param save_path: Save the figure as an image at this path instead of showing it
+    """
+    figure = _new_figure(save_path)
+    draw_parking_grid(figure.add_subplot(), grid, start, closest_spots)
+    _finish(figure, save_path)
+
+
+def visualize_route_on_parking_grid(grid: Grid,
+                                    start: Tuple[int, int],
+                                    route: List[Tuple[int, int]],
+                                    save_path: Optional[str] = None):
+    """
+    Visualize the parking grid with the route from the start point to a parking spot.
+
+    :param grid: 2D list or array representing the parking area (0 for empty, 1 for occupied)
+    :param start: Starting coordinates (row, col)
+    :param route: List of coordinates representing the route
+    :param save_path: Save the figure as an image at this path instead of showing it
+    """
+    figure = _new_figure(save_path)
+    draw_route_on_parking_grid(figure.add_subplot(), grid, start, route)
+    _finish(figure, save_path)
+
+
+def draw_parking_grid(ax, grid: Grid,
+                      start: Tuple[int, int],
+                      closest_spots: List[Tuple[int, int, int]]):
+    """
+    Draw the parking grid with closest parking spots on an existing axes.
+
+    :param ax: Matplotlib axes, for example of a canvas embedded in a window
+    :param grid: 2D list or array representing the parking area (0 for empty, 1 for occupied)
     :param start: Starting coordinates (row, col)
     :param closest_spots: List of closest parking spots with their distances
     """
-    rows, cols = len(grid), len(grid[0])
-    
-    # Create a color grid
-    color_grid = np.zeros((rows, cols, 3))
-    
     # Color coding
     # Occupied spots: Red
     # Empty spots: Green
     # Start point: Yellow
     # Closest spots: Blue
-    for row in range(rows):
-        for col in range(cols):
-            if grid[row][col] == 1:  # Occupied
-                color_grid[row, col] = [1, 0, 0]  # Red
-            else:  # Empty
-                color_grid[row, col] = [0, 1, 0]  # Green
-    
-    # Mark start point
-    color_grid[start[0], start[1]] = [1, 1, 0]  # Yellow
-    
-    # Mark closest spots
-    for spot in closest_spots:
-        color_grid[spot[0], spot[1]] = [0, 0, 1]  # Blue
-    
-    # Plotting
-    plt.figure(figsize=(10, 8))
-    plt.imshow(color_grid)
-    plt.title(f"Parking Grid - Closest Spots from {start}")
-    
-    # Add grid lines
-    for x in range(cols + 1):
-        plt.axvline(x - 0.5, color='black', linewidth=1)
-    for y in range(rows + 1):
-        plt.axhline(y - 0.5, color='black', linewidth=1)
-    
-    # Add spot coordinates and distances
-    for row in range(rows):
-        for col in range(cols):
-            # Coordinate text
-            plt.text(col, row, f"({row},{col})", 
-                     ha='center', va='center', color='white', fontsize=8)
-    
+    color_grid = _color_image(grid, start, [spot[:2] for spot in closest_spots], (0, 0, 1))
+    _draw_grid(ax, color_grid, f"Parking Grid - Closest Spots from {start}", "blue", "Closest Spots")
+
     # Annotate closest spots with their distances
     for spot in closest_spots:
         row, col, distance = spot
-        plt.text(col, row, f"D:{distance}", 
-                 ha='center', va='bottom', color='white', fontsize=8)
-    
-    plt.xticks(range(cols))
-    plt.yticks(range(rows))
-    plt.grid(False)
-    
-    # Add a legend
-    legend_elements = [
-        plt.Rectangle((0, 0), 1, 1, color='red', label='Occupied'),
-        plt.Rectangle((0, 0), 1, 1, color='green', label='Empty'),
-        plt.Rectangle((0, 0), 1, 1, color='yellow', label='Start Point'),
-        plt.Rectangle((0, 0), 1, 1, color='blue', label='Closest Spots')
-    ]
-    plt.legend(handles=legend_elements, loc='center left', bbox_to_anchor=(1, 0.5))
-    
-    plt.tight_layout()
-    plt.show()
-
+        ax.text(col, row, f"D:{distance}",
+                ha='center', va='bottom', color='white', fontsize=8)
 
 
-def visualize_route_on_parking_grid(grid: List[List[int]], 
-                                    start: Tuple[int, int], 
-                                    route: List[Tuple[int, int]]):
+def draw_route_on_parking_grid(ax, grid: Grid,
+                               start: Tuple[int, int],
+                               route: List[Tuple[int, int]]):
     """
-    Visualize the parking grid with the route from the start point to a parking spot.
-    
-    :param grid: 2D list representing the parking area (0 for empty, 1 for occupied)
+    Draw the parking grid with the route to a parking spot on an existing axes.
+
+    :param ax: Matplotlib axes, for example of a canvas embedded in a window
+    :param grid: 2D list or array representing the parking area (0 for empty, 1 for occupied)
     :param start: Starting coordinates (row, col)
     :param route: List of coordinates representing the route
     """
-    rows, cols = len(grid), len(grid[0])
-
-    # Create a color grid
-    color_grid = np.zeros((rows, cols, 3))
-
     # Color coding
     # Occupied spots: Red
     # Empty spots: Green
     # Start point: Yellow
     # Route: Purple
-    for row in range(rows):
-        for col in range(cols):
-            if grid[row][col] == 1:  # Occupied
-                color_grid[row, col] = [1, 0, 0]  # Red
-            else:  # Empty
-                color_grid[row, col] = [0, 1, 0]  # Green
-
-    # Mark start point
-    color_grid[start[0], start[1]] = [1, 1, 0]  # Yellow
-
-    # Mark the route
-    for row, col in route:
-        color_grid[row, col] = [0.5, 0, 0.5]  # Purple for the route
-
-    # Plotting
-    plt.figure(figsize=(10, 8))
-    plt.imshow(color_grid)
-    plt.title(f"Parking Grid - Route from {start} to {route[-1]}")
-
-    # Add grid lines
-    for x in range(cols + 1):
-        plt.axvline(x - 0.5, color='black', linewidth=1)
-    for y in range(rows + 1):
-        plt.axhline(y - 0.5, color='black', linewidth=1)
-
-    # Add spot coordinates
-    for row in range(rows):
-        for col in range(cols):
-            plt.text(col, row, f"({row},{col})", 
-                     ha='center', va='center', color='white', fontsize=8)
-
-    plt.xticks(range(cols))
-    plt.yticks(range(rows))
-    plt.grid(False)
+    color_grid = _color_image(grid, start, route, (0.5, 0, 0.5))
+    end = route[-1] if route else start
+    _draw_grid(ax, color_grid, f"Parking Grid - Route from {start} to {end}", "purple", "Route")
+
+
+def _color_image(grid: Grid, start: Tuple[int, int],
+                 highlighted: Sequence[Tuple[int, int]], highlight_color: Tuple[float, float, float]) -> np.ndarray:
+    """
+    Build the RGB image of the grid with one palette lookup.
+
+    :param grid: 2D list or array representing the parking area
+    :param start: Starting coordinates (row, col), drawn yellow
+    :param highlighted: Cells drawn in the highlight color, over the start
+    :param highlight_color: RGB color of the highlighted cells
+    :return: Float array of shape (rows, cols, 3)
+    """
+    codes = np.array(grid, dtype=np.uint8)
+    codes[start[0], start[1]] = START
+    if len(highlighted):
+        rows, cols = zip(*highlighted)
+        codes[list(rows), list(cols)] = HIGHLIGHT
+
+    palette = np.array([
+        (0, 1, 0),  # Empty: Green
+        (1, 0, 0),  # Occupied: Red
+        (1, 1, 0),  # Start: Yellow
+        highlight_color,
+    ], dtype=float)
+    return palette[codes]
+
+
+def _draw_grid(ax, color_grid: np.ndarray, title: str, highlight_name: str, highlight_label: str):
+    """
+    Draw a colored grid with grid lines, labels and a legend on an axes.
+
+    :param ax: Matplotlib axes to draw on
+    :param color_grid: RGB image of the grid
+    :param title: Axes title
+    :param highlight_name: Matplotlib color name of the highlighted cells
+    :param highlight_label: Legend label of the highlighted cells
+    """
+    rows, cols = color_grid.shape[:2]
+    ax.imshow(color_grid, interpolation='nearest')
+    ax.set_title(title)
+
+    # Add grid lines as a single artist
+    if max(rows, cols) <= GRIDLINE_LIMIT:
+        segments = ([((x - 0.5, -0.5), (x - 0.5, rows - 0.5)) for x in range(cols + 1)] +
+                    [((-0.5, y - 0.5), (cols - 0.5, y - 0.5)) for y in range(rows + 1)])
+        ax.add_collection(LineCollection(segments, colors='black', linewidths=1))
+
+    # Add spot coordinates on grids small enough to read them
+    if rows * cols <= LABEL_CELL_LIMIT:
+        for row in range(rows):
+            for col in range(cols):
+                ax.text(col, row, f"({row},{col})",
+                        ha='center', va='center', color='white', fontsize=8)
+        ax.set_xticks(range(cols))
+        ax.set_yticks(range(rows))
+    ax.grid(False)
 
     # Add a legend
     legend_elements = [
-        plt.Rectangle((0, 0), 1, 1, color='red', label='Occupied'),
-        plt.Rectangle((0, 0), 1, 1, color='green', label='Empty'),
-        plt.Rectangle((0, 0), 1, 1, color='yellow', label='Start Point'),
-        plt.Rectangle((0, 0), 1, 1, color='purple', label='Route')
+        Rectangle((0, 0), 1, 1, color='red', label='Occupied'),
+        Rectangle((0, 0), 1, 1, color='green', label='Empty'),
+        Rectangle((0, 0), 1, 1, color='yellow', label='Start Point'),
+        Rectangle((0, 0), 1, 1, color=highlight_name, label=highlight_label)
     ]
-    plt.legend(handles=legend_elements, loc='center left', bbox_to_anchor=(1, 0.5))
+    ax.legend(handles=legend_elements, loc='center left', bbox_to_anchor=(1, 0.5))
+
 
-    plt.tight_layout()
-    plt.show()
+def _new_figure(save_path: Optional[str]) -> Figure:
+    """
+    Create the figure to draw on.
+
+    :param save_path: Image path in headless mode, or None for an interactive pyplot figure
+    :return: Matplotlib figure
+    """
+    if save_path:
+        # Headless: a bare figure on an Agg canvas, no pyplot or GUI backend
+        figure = Figure(figsize=(10, 8))
+        FigureCanvasAgg(figure)
+        return figure
+
+    # pyplot and its GUI backend load only when a window is shown
+    import matplotlib.pyplot as plt
+    return plt.figure(figsize=(10, 8))
+
+
+def _finish(figure: Figure, save_path: Optional[str]):
+    """
+    Lay out the figure, then save it or show it.
+
+    :param figure: Matplotlib figure
+    :param save_path: Image path in headless mode, or None to show the figure
+    """
+    figure.tight_layout()
+    if save_path:
+        figure.savefig(save_path)
+    else:
+        import matplotlib.pyplot as plt
+        plt.show()
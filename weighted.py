@@ -0,0 +1,254 @@
+import heapq
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from bfs_parking import ParkingSpotFinder
+
+Grid = Union[List[List[int]], np.ndarray]
+
+# Direction bits of the allowed-exits mask, in exploration order
+UP, RIGHT, DOWN, LEFT = 1, 2, 4, 8
+ALL_DIRECTIONS = UP | RIGHT | DOWN | LEFT
+
+# Heading of the start state, before any move
+NO_HEADING = 4
+
+# Integer steps up to this cost use the bucket queue instead of a heap
+BUCKET_LIMIT = 64
+
+
+class WeightedParkingSpotFinder:
+    def __init__(self, parking_grid: Grid, costs: Optional[np.ndarray] = None,
+                 directions: Optional[np.ndarray] = None, turn_penalty: Union[int, float] = 0):
+        """
+        Cost-aware parking spot finder for lots with lanes and one-way aisles.
+
+        Moving into a cell costs that cell's weight, a change of heading adds
+        the turn penalty (twice for a U-turn), and each cell only lets
+        vehicles leave in the directions its mask allows. Searches use a
+        bucket queue when all step costs are small integers (0-1 weights
+        included) and a binary heap otherwise. With uniform weights, no
+        direction limits and no turn penalty the unweighted BFS of
+        ParkingSpotFinder is used instead.
+
+        :param parking_grid: 2D list or NumPy array representing the parking area
+        0 represents an empty spot, 1 represents an occupied spot
+        :param costs: Non-negative cost of entering each cell, 1 everywhere if omitted
+        :param directions: Allowed exits of each cell as UP | RIGHT | DOWN | LEFT bits,
+        all directions if omitted
+        :param turn_penalty: Non-negative cost added when the heading changes
+        """
+        self.finder = ParkingSpotFinder(parking_grid)
+        rows, cols = self.finder.rows, self.finder.cols
+        self.rows, self.cols = rows, cols
+
+        costs = np.ones((rows, cols), dtype=np.int64) if costs is None else np.asarray(costs)
+        directions = (np.full((rows, cols), ALL_DIRECTIONS, dtype=np.uint8)
+                      if directions is None else np.asarray(directions))
+        if costs.shape != (rows, cols) or directions.shape != (rows, cols):
+            raise ValueError("Costs and directions must have the shape of the parking grid")
+        if not np.isfinite(costs).all() or (costs < 0).any():
+            raise ValueError("Costs must be finite and non-negative")
+        if ((directions < 0) | (directions > ALL_DIRECTIONS)).any():
+            raise ValueError("Directions must be combinations of UP, RIGHT, DOWN and LEFT")
+        if turn_penalty < 0:
+            raise ValueError("Turn penalty must be non-negative")
+
+        # Integer costs that fit the bucket queue keep exact integer distances;
+        # an integer-valued penalty such as 2.0 is stored as an int so bucket
+        # indices stay integers
+        integral = np.issubdtype(costs.dtype, np.integer) and float(turn_penalty).is_integer()
+        if integral:
+            turn_penalty = int(turn_penalty)
+
+        self.costs = costs
+        self.directions = directions
+        self.turn_penalty = turn_penalty
+
+        largest_step = int(costs.max()) + 2 * int(turn_penalty) if integral else None
+        self._bucketed = integral and largest_step <= BUCKET_LIMIT
+        self._bucket_count = largest_step + 1 if self._bucketed else 0
+        self._uniform = (turn_penalty == 0 and costs.min() == costs.max() > 0
+                         and bool((directions == ALL_DIRECTIONS).all()))
+
+        # Entry costs and allowed exits over the finder's padded layout; moves
+        # off the grid are removed from the exits so the border is never entered
+        finder = self.finder
+        height, width = rows + 2, finder._width
+        padded_costs = np.zeros((height, width), dtype=np.int64 if integral else np.float64)
+        padded_costs[1:rows + 1, 1:cols + 1] = costs
+        exits = np.zeros((height, width), dtype=np.uint8)
+        exits[1:rows + 1, 1:cols + 1] = directions
+        exits[1, 1:cols + 1] &= ~UP & 0xFF
+        exits[rows, 1:cols + 1] &= ~DOWN & 0xFF
+        exits[1:rows + 1, 1] &= ~LEFT & 0xFF
+        exits[1:rows + 1, cols] &= ~RIGHT & 0xFF
+        self._costs = padded_costs.reshape(-1).tolist()
+        self._exits = exits.reshape(-1).tolist()
+        self._offsets = (-width, 1, width, -1)
+        self._headings = 5 if turn_penalty else 1
+        self._unreached = float("inf")
+
+    def set_occupied(self, row: int, col: int, occupied: bool):
+        """
+        Change the occupancy of a single spot.
+
+        :param row: Row index
+        :param col: Column index
+        :param occupied: True to mark the spot occupied, False to mark it empty
+        """
+        self.finder.set_occupied(row, col, occupied)
+
+    def find_closest_parking_spots(self, start: Tuple[int, int]) -> List[Tuple[int, int, Union[int, float]]]:
+        """
+        Find all empty parking spots with the lowest travel cost.
+
+        :param start: Starting coordinates (row, col)
+        :return: List of tuples (row, col, cost) of the cheapest empty spots
+        """
+        if not self.finder._is_valid_position(start[0], start[1]):
+            raise ValueError("Invalid starting position")
+
+        if self._uniform:
+            step = self.costs.flat[0].item()
+            return [(row, col, distance * step)
+                    for row, col, distance in self.finder.find_closest_parking_spots(start)]
+
+        cells = self.finder._cells
+        headings = self._headings
+        best = None
+        spots = []
+        for cost, state in self._settle(self.finder._index(start[0], start[1]), None):
+            if best is not None and cost > best:
+                break
+            index = state // headings
+            if cells[index] == 0 and index not in spots:
+                best = cost
+                spots.append(index)
+        return [self.finder._coords(index) + (best,) for index in spots]
+
+    def find_route_to_parking_spot(self, start: Tuple[int, int], target: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """
+        Find the cheapest route from the start to the target parking spot.
+
+        :param start: Starting coordinates (row, col)
+        :param target: Target parking spot coordinates (row, col)
+        :return: List of tuples representing the route (row, col), empty if the
+        target cannot be reached
+        """
+        finder = self.finder
+        if not (finder._is_valid_position(*start) and finder._is_valid_position(*target)):
+            raise ValueError("Invalid start or target position")
+
+        if self._uniform:
+            return finder.find_route_to_parking_spot(start, target)
+
+        headings = self._headings
+        start_state = finder._index(start[0], start[1]) * headings + (NO_HEADING if headings > 1 else 0)
+        target_index = finder._index(target[0], target[1])
+        parents = {}
+        for _, state in self._settle(start_state // headings, parents):
+            if state // headings == target_index:
+                route = [state]
+                while state != start_state:
+                    state = parents[state]
+                    route.append(state)
+                return [finder._coords(state // headings) for state in reversed(route)]
+
+        # Return an empty path if no route is found
+        return []
+
+    def route_cost(self, route: List[Tuple[int, int]]) -> Union[int, float]:
+        """
+        Get the travel cost of a route under this finder's weights and turn penalty.
+
+        :param route: List of adjacent (row, col) coordinates
+        :return: Total cost of entering each cell after the first, plus turn penalties
+        """
+        total = 0
+        heading = None
+        for (row, col), (next_row, next_col) in zip(route, route[1:]):
+            move = (next_row - row, next_col - col)
+            total += self.costs[next_row, next_col].item()
+            if heading is not None and move != heading:
+                total += self.turn_penalty * (2 if move == (-heading[0], -heading[1]) else 1)
+            heading = move
+        return total
+
+    def _settle(self, start_index: int,
+                parents: Optional[Dict[int, int]]) -> Iterator[Tuple[Union[int, float], int]]:
+        """
+        Run Dijkstra from a cell, yielding states in order of their final cost.
+
+        States are cells, or cells times their heading when turns cost extra.
+        Costs and parents are kept only for reached states, so a search that
+        settles its answer near the start stays cheap on any grid size.
+
+        :param start_index: Flat index of the starting cell
+        :param parents: Optional dict receiving the parent of each improved state
+        :return: Iterator of (cost, state)
+        """
+        costs, exits, offsets = self._costs, self._exits, self._offsets
+        headings, turn_penalty = self._headings, self._turn_costs()
+        unreached = self._unreached
+
+        start = start_index * headings + (NO_HEADING if headings > 1 else 0)
+        best = {start: 0}
+
+        # Dial's algorithm keeps a ring of buckets indexed by cost modulo the
+        # bucket count; every pending cost lies within one largest step of the
+        # current one, so each bucket holds a single cost
+        bucketed = self._bucketed
+        if bucketed:
+            ring = [[] for _ in range(self._bucket_count)]
+            ring[0].append(start)
+            current = 0
+        else:
+            heap = [(0, start)]
+        pending = 1
+
+        while pending:
+            if bucketed:
+                bucket = ring[current % len(ring)]
+                while not bucket:
+                    current += 1
+                    bucket = ring[current % len(ring)]
+                cost, state = current, bucket.pop()
+            else:
+                cost, state = heapq.heappop(heap)
+            pending -= 1
+            if cost > best[state]:
+                continue
+            yield cost, state
+
+            index, heading = divmod(state, headings)
+            allowed = exits[index]
+            for direction in range(4):
+                if not allowed & (1 << direction):
+                    continue
+                neighbor = index + offsets[direction]
+                step = costs[neighbor]
+                if headings > 1:
+                    step += turn_penalty[heading][direction]
+                    neighbor = neighbor * headings + direction
+                if cost + step < best.get(neighbor, unreached):
+                    best[neighbor] = cost + step
+                    if parents is not None:
+                        parents[neighbor] = state
+                    if bucketed:
+                        ring[(cost + step) % len(ring)].append(neighbor)
+                    else:
+                        heapq.heappush(heap, (cost + step, neighbor))
+                    pending += 1
+
+    def _turn_costs(self) -> List[List[Union[int, float]]]:
+        """
+        Get the turn penalty for each (previous heading, next direction) pair.
+
+        :return: 5x4 table; the last row is the start, where no turn is charged
+        """
+        penalty = self.turn_penalty
+        table = [[0 if heading == direction else penalty * (2 if (heading + 2) % 4 == direction else 1)
+                  for direction in range(4)] for heading in range(4)]
+        table.append([0, 0, 0, 0])
+        return table